@@ -3,12 +3,18 @@ from starlette.responses import JSONResponse
 import torch
 import nvidia_smi
 
+from utils.readiness import get_worker_readiness
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health():
-    return JSONResponse(status_code=status.HTTP_200_OK, content={"health": "good"})
+    # 워커별 모델 preload 상태 (warming / ready / failed)
+    workers = get_worker_readiness()
+    ready = bool(workers) and all(worker["state"] == "ready" for worker in workers.values())
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content={"health": "good", "ready": ready, "workers": workers})
 
 
 @router.get("/cuda_available")
@@ -1,5 +1,10 @@
 from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
 
+from utils.object_storage import get_result_upload
+from utils.placement import AUTO_DEVICE
+from utils.result_cache import apply_async_cached
+from utils.staging import stage_uploads
 from workers.tasks.generation import cleanup_task
 
 router = APIRouter(
@@ -11,27 +16,18 @@ router = APIRouter(
 async def cleanup(request: Request):
     form = await request.form()
 
-    images = form.getlist("images")
-    bytes_init_image_list = []
-    for image in images:
-        contents = image.file.read()
-        bytes_init_image_list.append(contents)
-        image.file.close()
-
-    masks = form.getlist("masks")
-    bytes_mask_image_list = []
-    for image in masks:
-        contents = image.file.read()
-        bytes_mask_image_list.append(contents)
-        image.file.close()
+    # 업로드 파일은 공유 디스크에 저장하고 Celery에는 참조(sha256)만 전달
+    init_image_refs = await stage_uploads(form.getlist("images"))
+    mask_image_refs = await stage_uploads(form.getlist("masks"))
 
     form_data = {
-        "images": bytes_init_image_list,
-        "masks": bytes_mask_image_list,
-        "gpu_device": int(form.get("gpu_device")),
-        "model":"lama"
+        "images": init_image_refs,
+        "masks": mask_image_refs,
+        "gpu_device": form.get("gpu_device", AUTO_DEVICE),
+        "model":"lama",
+        "result_upload": get_result_upload(form),
     }
 
-    task = cleanup_task.apply_async(kwargs=form_data)
+    task = await run_in_threadpool(apply_async_cached, cleanup_task, form_data, form_data["model"])
 
     return {"task_id": task.id}
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
 
+from utils.placement import AUTO_DEVICE, apply_async_on_device
+from utils.staging import stage_uploads
 from workers.tasks.generation import clip_task
 
 router = APIRouter(
@@ -11,23 +14,18 @@ router = APIRouter(
 async def clip(request: Request):
     form = await request.form()
 
-    images = form.getlist("images")
-
-    bytes_image_list = []
-    for image in images:
-        contents = image.file.read()
-        bytes_image_list.append(contents)
-        image.file.close()
+    # 업로드 파일은 공유 디스크에 저장하고 Celery에는 참조(sha256)만 전달
+    image_refs = await stage_uploads(form.getlist("images"))
 
     form_data = {
         "model": form.get("model"),
-        "gpu_device": int(form.get("gpu_device")),
+        "gpu_device": form.get("gpu_device", AUTO_DEVICE),
         "mode": form.get("mode"),
         "caption": form.get("caption"),
-        "images": bytes_image_list,
+        "images": image_refs,
         "batch_size": int(form.get("batch_size"))
     }
 
-    task = clip_task.apply_async(kwargs=form_data)
+    task = await run_in_threadpool(apply_async_on_device, clip_task, form_data, form_data["model"])
 
     return {"task_id": task.id}
@@ -1,5 +1,10 @@
 from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
 
+from utils.object_storage import get_result_upload
+from utils.placement import AUTO_DEVICE
+from utils.result_cache import apply_async_cached
+from utils.staging import stage_uploads
 from workers.tasks.generation import inpainting_task
 
 router = APIRouter(
@@ -13,24 +18,13 @@ async def inpainting(
 ):
     form = await request.form()
 
-    init_image_files = form.getlist("init_image")
-
-    bytes_init_image_list = []
-    for image in init_image_files:
-        contents = image.file.read()
-        bytes_init_image_list.append(contents)
-        image.file.close()
-
-    mask_image_files = form.getlist("mask_image")
-    bytes_mask_image_list = []
-    for image in mask_image_files:
-        contents = image.file.read()
-        bytes_mask_image_list.append(contents)
-        image.file.close()
+    # 업로드 파일은 공유 디스크에 저장하고 Celery에는 참조(sha256)만 전달
+    init_image_refs = await stage_uploads(form.getlist("init_image"))
+    mask_image_refs = await stage_uploads(form.getlist("mask_image"))
 
     form_data = {
         "model": form.get("model"),
-        "gpu_device": int(form.get("gpu_device")),
+        "gpu_device": form.get("gpu_device", AUTO_DEVICE),
         "scheduler": form.get("scheduler"),
         "prompt": form.get("prompt"),
         "negative_prompt": form.get("negative_prompt"),
@@ -39,13 +33,14 @@ async def inpainting(
         "num_inference_steps": int(form.get("num_inference_steps")),
         "guidance_scale": float(form.get("guidance_scale")),
         "strength": float(form.get("strength")),
-        "init_image_files": bytes_init_image_list,
-        "mask_image_files": bytes_mask_image_list,
+        "init_image_files": init_image_refs,
+        "mask_image_files": mask_image_refs,
         "seed": int(form.get("seed")),
         "batch_count": int(form.get("batch_count")),
-        "batch_size": int(form.get("batch_size"))
+        "batch_size": int(form.get("batch_size")),
+        "result_upload": get_result_upload(form),
     }
 
-    task = inpainting_task.apply_async(kwargs=form_data)
+    task = await run_in_threadpool(apply_async_cached, inpainting_task, form_data, form_data["model"])
 
     return {"task_id": task.id}
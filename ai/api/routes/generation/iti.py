@@ -1,5 +1,10 @@
 from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
 
+from utils.object_storage import get_result_upload
+from utils.placement import AUTO_DEVICE
+from utils.result_cache import apply_async_cached
+from utils.staging import stage_uploads
 from workers.tasks.generation import image_to_image_task
 
 router = APIRouter(
@@ -13,17 +18,12 @@ async def image_to_image(
 ):
     form = await request.form()
 
-    images = form.getlist("images")
-
-    bytes_image_list = []
-    for image in images:
-        contents = image.file.read()
-        bytes_image_list.append(contents)
-        image.file.close()
+    # 업로드 파일은 공유 디스크에 저장하고 Celery에는 참조(sha256)만 전달
+    image_refs = await stage_uploads(form.getlist("images"))
 
     form_data = {
         "model": form.get("model"),
-        "gpu_device": int(form.get("gpu_device")),
+        "gpu_device": form.get("gpu_device", AUTO_DEVICE),
         "scheduler": form.get("scheduler"),
         "prompt": form.get("prompt"),
         "negative_prompt": form.get("negative_prompt"),
@@ -35,9 +35,10 @@ async def image_to_image(
         "seed": int(form.get("seed")),
         "batch_count": int(form.get("batch_count")),
         "batch_size": int(form.get("batch_size")),
-        "images": bytes_image_list
+        "images": image_refs,
+        "result_upload": get_result_upload(form),
     }
 
-    task = image_to_image_task.apply_async(kwargs=form_data)
+    task = await run_in_threadpool(apply_async_cached, image_to_image_task, form_data, form_data["model"])
 
     return {"task_id": task.id}
@@ -1,12 +1,17 @@
-import io
 import json
+import os
 
 from celery.result import AsyncResult
 from fastapi import APIRouter, status, HTTPException
-from starlette.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, FileResponse
 
 from api.routes.generation import cleanup, iti, inpainting, rembg, tti, clip
 from schema import CeleryTaskResponse
+from utils.object_storage import is_uploaded_result
+from utils.result import is_result_archive, sweep_results_periodically
+from utils.result_cache import store_cached_result
+from utils.scheduler import get_scheduler_names
 
 router = APIRouter(
     prefix="/generation",
@@ -20,9 +25,29 @@ router.include_router(rembg.router)
 router.include_router(cleanup.router)
 router.include_router(clip.router)
 
+# 응답(및 backend의 Log)에 포함하지 않는 인자 (입력 이미지 참조, 결과 업로드용 presigned POST)
+HIDDEN_TASK_ARGUMENTS = ["images", "init_image_files", "mask_image_files", "masks", "result_upload"]
+
+
+def get_task_arguments(result: AsyncResult) -> dict:
+    return {k: v for k, v in (result.kwargs or {}).items() if k not in HIDDEN_TASK_ARGUMENTS}
+
+
+@router.get("/schedulers")
+async def get_scheduler_list():
+    return get_scheduler_names()
+
+
+def finish_result_download(result: AsyncResult, archive_path: str):
+    # 전송이 끝난 뒤에만 spool 파일과 task 결과를 삭제 (전송에 실패하면 다시 요청해 받을 수 있음)
+    os.remove(archive_path)
+    result.forget()
+
 
 @router.get("/tasks/{task_id}")
 async def get_task_status(task_id: str):
+    await sweep_results_periodically()
+
     result = AsyncResult(task_id)
 
     if result.status == "PENDING":
@@ -36,7 +61,7 @@ async def get_task_status(task_id: str):
         response = CeleryTaskResponse(
             task_name=result.name,
             task_status=result.status,
-            task_arguments=result.kwargs,
+            task_arguments=get_task_arguments(result),
             message="Task가 진행중입니다."
         ).model_dump(exclude_none=True)
         return JSONResponse(status_code=status.HTTP_200_OK, content=response)
@@ -45,7 +70,7 @@ async def get_task_status(task_id: str):
         response = CeleryTaskResponse(
             task_name=result.name,
             task_status=result.status,
-            task_arguments=result.kwargs,
+            task_arguments=get_task_arguments(result),
             result_data_type=type(result.result).__name__,
             result_data=str(result.result)
         ).model_dump(exclude_none=True)
@@ -54,31 +79,48 @@ async def get_task_status(task_id: str):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=response)
 
     elif result.status == "SUCCESS":
-        # 결과가 Image(ZIP FILE)일 때
-        if isinstance(result.result, io.BytesIO):
-            task_result = result.result
+        # 결과가 Image(ZIP FILE)일 때: 워커가 디스크에 저장한 ZIP을 그대로 스트리밍
+        if is_result_archive(result.result):
+            archive_path = result.result["path"]
             task_name = result.name
             task_arguments = result.kwargs
 
-            # JSON 직렬화를 통해 Log에 저장될 arguments에서 Byte 파일 (이미지) 제거
-            keys_to_remove = ["images", "init_image_files", "mask_image_files", "masks"]
-            for key in keys_to_remove:
-                task_arguments.pop(key, None)
+            if not os.path.exists(archive_path):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="결과 파일을 찾을 수 없습니다.")
+
+            # 같은 요청이 다시 들어오면 GPU 작업 없이 재사용할 수 있도록 캐시에 등록
+            store_cached_result(task_name, task_arguments, result.result)
+
+            # JSON 직렬화를 통해 Log에 저장될 arguments에서 입력 이미지 등 제거
+            task_arguments = get_task_arguments(result)
+
+            return FileResponse(archive_path, media_type="application/zip",
+                                # 전송이 끝나면 spool 파일과 task 결과 삭제
+                                background=BackgroundTask(finish_result_download, result, archive_path),
+                                # 필요한 정보는 헤더에 넣어줘서 응답
+                                headers={
+                                    "Content-Disposition": "attachment; filename=images.zip",
+                                    "Task-Name": task_name,
+                                    "Task-Arguments": json.dumps(task_arguments),
+                                })
+        # 워커가 결과 이미지를 오브젝트 스토리지에 직접 올렸을 때: URL과 크기만 전달
+        elif is_uploaded_result(result.result):
+            response = CeleryTaskResponse(
+                task_name=result.name,
+                task_status=result.status,
+                task_arguments=get_task_arguments(result),
+                result_data_type="image_urls",
+                result_data=result.result
+            ).model_dump(exclude_none=True)
 
             result.forget()
-            return StreamingResponse(task_result, media_type="application/zip",
-                                     # 필요한 정보는 헤더에 넣어줘서 응답
-                                     headers={
-                                         "Content-Disposition": "attachment; filename=images.zip",
-                                         "Task-Name": task_name,
-                                         "Task-Arguments": json.dumps(task_arguments),
-                                     })
+            return JSONResponse(status_code=status.HTTP_200_OK, content=response)
         # 결과가 Json Serializable한 객체일 때
         else:
             response = CeleryTaskResponse(
                 task_name=result.name,
                 task_status=result.status,
-                task_arguments=result.kwargs,
+                task_arguments=get_task_arguments(result),
                 result_data_type=type(result.result).__name__,
                 result_data=result.result
             ).model_dump(exclude_none=True)
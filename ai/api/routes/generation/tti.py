@@ -1,5 +1,9 @@
 from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
 
+from utils.object_storage import get_result_upload
+from utils.placement import AUTO_DEVICE
+from utils.result_cache import apply_async_cached
 from workers.tasks.generation import text_to_image_task
 
 router = APIRouter(
@@ -12,7 +16,7 @@ async def text_to_image(request: Request):
 
     form_data = {
         "model": form.get("model"),
-        "gpu_device": int(form.get("gpu_device")),
+        "gpu_device": form.get("gpu_device", AUTO_DEVICE),
         "scheduler": form.get("scheduler"),
         "prompt": form.get("prompt"),
         "negative_prompt": form.get("negative_prompt"),
@@ -22,9 +26,10 @@ async def text_to_image(request: Request):
         "guidance_scale": float(form.get("guidance_scale")),
         "seed": int(form.get("seed")),
         "batch_count": int(form.get("batch_count")),
-        "batch_size": int(form.get("batch_size"))
+        "batch_size": int(form.get("batch_size")),
+        "result_upload": get_result_upload(form),
     }
 
-    task = text_to_image_task.apply_async(kwargs=form_data)
+    task = await run_in_threadpool(apply_async_cached, text_to_image_task, form_data, form_data["model"])
 
     return {"task_id": task.id}
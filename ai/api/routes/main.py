@@ -3,6 +3,7 @@ from .generation import main as generation
 from .device import main as device
 from .training import main as training
 from .model import main as model
+from .metrics import main as metrics
 
 
 api_router = APIRouter(
@@ -13,3 +14,4 @@ api_router.include_router(generation.router)
 api_router.include_router(training.router)
 api_router.include_router(device.router)
 api_router.include_router(model.router)
+api_router.include_router(metrics.router)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+
+from utils.metrics import render_metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics API"]
+)
+
+
+# render_metrics는 동기 Redis 클라이언트를 사용하므로 threadpool에서 실행되도록 일반 함수로 정의
+@router.get("")
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
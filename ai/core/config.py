@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -8,6 +10,10 @@ class Settings(BaseSettings):
     # ENVIRONMENT
     DOWNLOAD_TEMP_DIR: str
     OUTPUT_DIR: str
+    RESULT_DIR: str = "./results"   # 생성 결과 ZIP을 임시로 저장하는 경로 (API 서버와 워커가 공유)
+    RESULT_TTL_SECONDS: int = 86400     # 이 시간이 지나도록 가져가지 않은 결과 ZIP은 삭제
+    STAGING_DIR: str = "./staging"  # 업로드된 입력 이미지를 내용 해시로 저장하는 경로 (API 서버와 워커가 공유)
+    STAGING_TTL_SECONDS: int = 86400    # 마지막 업로드 이후 이 시간이 지난 입력 파일은 삭제
     DIFFUSERS_TRAIN_PATH: str
     BASE_MODEL_NAME: str
     MULTI_CONCEPT_TRAIN_PATH: str
@@ -16,5 +22,74 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: str
 
+    # RESULT CACHE
+    RESULT_CACHE_DIR: str = "./result_cache"   # RESULT_DIR과 같은 파일 시스템이면 hard link로 공유
+    RESULT_CACHE_MAX_SIZE_MB: int = 10240      # 0이면 캐시 사용 안 함
+
+    # GPU PLACEMENT
+    GEN_QUEUE_PREFIX: str = "gen_queue"     # GPU별 큐 이름은 gen_queue_0, gen_queue_1, ...
+    PLACEMENT_RESIDENT_TTL: int = 3600      # 워커가 알려준 상주 모델 목록의 유효 시간 (초)
+    PLACEMENT_QUEUE_CHECK_INTERVAL: int = 30    # GPU별 큐를 소비하는 워커 목록을 다시 확인하는 주기 (초)
+    PLACEMENT_INSPECT_TIMEOUT: float = 0.5      # 워커 목록을 확인할 때 응답을 기다리는 시간 (초)
+
+    # TASK EVENTS
+    TASK_EVENT_TTL: int = 3600              # 마지막 task 이벤트를 보관하는 시간 (구독 전에 끝난 task 확인용, 초)
+
+    # WORKER PRELOAD
+    WORKER_GPU_DEVICE: Optional[int] = None         # 생성 워커가 담당하는 GPU (-Q gen_queue_<n>과 같은 번호)
+    PRELOAD_ENABLED: bool = True                    # 워커 시작 시 BASE_MODEL_NAME의 모델을 미리 로드
+    PRELOAD_CLIP_MODEL: str = "ViT-L-14/openai"     # 빈 문자열이면 미리 로드하지 않음
+    PRELOAD_RMBG_MODEL: str = "briaai/RMBG-1.4"
+    READINESS_TTL: int = 60                         # heartbeat가 멈춘 워커의 preload 상태를 보관하는 시간 (초)
+    READINESS_HEARTBEAT_INTERVAL: int = 20          # preload 상태의 TTL을 갱신하는 주기 (초)
+
+    # CLIP
+    CLIP_CACHE_PATH: str = "./cache"
+    CLIP_CHUNK_SIZE: int = 1024         # 라벨 테이블 임베딩을 계산할 때의 chunk 크기
+    CLIP_MAX_BATCH_SIZE: int = 16       # 한 번의 CLIP/BLIP forward에 넣을 최대 이미지 수
+
+    # CPU
+    TORCH_NUM_THREADS: int = 0          # 워커 프로세스의 PyTorch intra-op 스레드 수 (0이면 PyTorch 기본값, 워커 시작 시 한 번 적용)
+
+    # REMOVE BACKGROUND
+    RMBG_MAX_BATCH_SIZE: int = 16       # 한 번의 forward에 넣을 최대 이미지 수 (1024x1024 입력)
+
+    # CLEAN UP (iopaint LaMa)
+    CLEANUP_DEVICE: str = "cpu"
+    CLEANUP_WORKERS: int = 1            # CPU에서 동시에 inpainting할 이미지 수
+
+    # PIPELINE CACHE
+    PIPELINE_CACHE_MAX_MEMORY_MB: int = 12288  # 디바이스당 상주 파이프라인 메모리 상한 (0이면 캐시 사용 안 함)
+
+    # MODEL CACHE (CLIP / RMBG / LaMa)
+    MODEL_CACHE_MAX_MEMORY_MB: int = 6144      # 디바이스당 상주 모델 메모리 상한 (0이면 캐시 사용 안 함)
+
+    # PROMPT EMBEDDING CACHE
+    PROMPT_EMBED_CACHE_MAX_MB: int = 256    # 텍스트 인코더 출력 캐시 상한 (GPU 메모리, 0이면 사용 안 함)
+
+    # PROFILING
+    PROFILING_ENABLED: bool = False                 # task 구간별 소요 시간/최대 메모리 측정 (CUDA 동기화 비용이 있음)
+    CUDA_MEMORY_RELEASE_POLICY: str = "never"       # never | always | threshold
+    CUDA_MEMORY_RELEASE_THRESHOLD: float = 0.9      # threshold 정책에서 reserved 메모리가 전체의 이 비율을 넘으면 해제
+
+    # IMAGE ENCODING
+    IMAGE_ENCODE_WORKERS: int = 4       # 결과 이미지를 동시에 인코딩할 스레드 수
+    JPEG_QUALITY: int = 75
+    JPEG_OPTIMIZE: bool = False         # True면 용량은 줄지만 인코딩이 느려진다
+    JPEG_SUBSAMPLING: int = -1          # -1: Pillow 기본값, 0: 4:4:4, 1: 4:2:2, 2: 4:2:0
+
+    # DIRECT RESULT UPLOAD
+    RESULT_UPLOAD_WORKERS: int = 8      # backend가 presigned POST를 넘겨준 경우 워커가 오브젝트 스토리지로 동시에 올리는 이미지 수
+    RESULT_UPLOAD_TIMEOUT: float = 30
+
+    # IMAGE-TO-IMAGE / INPAINTING BATCHING
+    IMAGE_BATCH_MAX_SIZE: int = 8       # 한 번의 호출에 쌓을 최대 이미지 수 (원본이 달라도 함께 쌓음)
+    IMAGE_BATCH_RESIZE_SOURCES: bool = False    # True면 img2img 원본을 width/height로 맞춰 크기가 다른 원본도 함께 쌓음 (출력 크기가 바뀜)
+
+    # TEXT-TO-IMAGE DYNAMIC BATCHING (워커를 threads pool로 실행해야 여러 요청이 묶인다)
+    TTI_BATCHING_ENABLED: bool = False      # prefork(동시 실행 1) 워커에서는 묶일 요청이 없고 대기 시간만 늘어나므로 기본은 끔
+    TTI_MAX_BATCH_SIZE: int = 8         # 한 번의 파이프라인 호출에서 생성할 최대 이미지 수
+    TTI_MAX_BATCH_WAIT_MS: int = 50     # 첫 요청 이후 다른 요청을 기다리는 최대 시간
+
 # 환경 변수 로드 및 검증
 settings = Settings()
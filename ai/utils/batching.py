@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, List
+
+
+@dataclass
+class BatchRequest:
+    key: Hashable       # 같은 key를 가진 요청끼리만 하나의 호출로 묶는다
+    items: List[Any]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class DynamicBatcher:
+    # 여러 task에서 들어온 요청을 모아 한 번의 파이프라인 호출로 처리
+    # 첫 요청이 들어온 뒤 max_wait 동안 같은 key의 요청을 max_batch_size만큼 모으고, 결과는 요청별로 다시 나눠준다
+    # (threads pool처럼 한 프로세스에서 여러 task가 동시에 실행될 때 효과가 있다)
+
+    def __init__(self, run_batch: Callable[[Hashable, List[Any]], List[Any]], max_batch_size: int, max_wait_ms: int):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending: List[BatchRequest] = []
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, key: Hashable, items: List[Any]) -> List[Any]:
+        return self.submit_async(key, items).result()
+
+    def submit_async(self, key: Hashable, items: List[Any]) -> Future:
+        # 결과를 기다리지 않고 Future를 돌려줌 (다음 배치를 먼저 넣어두고 이전 배치의 결과를 처리할 때 사용)
+        request = BatchRequest(key, items)
+
+        with self._cond:
+            # prefork 워커는 fork 이후 스레드가 없으므로 처음 사용할 때 시작
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="dynamic-batcher", daemon=True)
+                self._thread.start()
+
+            self._pending.append(request)
+            self._cond.notify_all()
+
+        return request.future
+
+    def _collect(self, first: BatchRequest) -> List[BatchRequest]:
+        batch = [first]
+        count = len(first.items)
+
+        for request in self._pending:
+            if request is first or request.key != first.key:
+                continue
+            if count + len(request.items) > self.max_batch_size:
+                break
+            batch.append(request)
+            count += len(request.items)
+
+        return batch
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+                first = self._pending[0]
+                deadline = first.enqueued_at + self.max_wait
+
+                while True:
+                    batch = self._collect(first)
+                    remaining = deadline - time.monotonic()
+
+                    if sum(len(request.items) for request in batch) >= self.max_batch_size or remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                for request in batch:
+                    self._pending.remove(request)
+
+            self._run(first.key, batch)
+
+    def _run(self, key: Hashable, batch: List[BatchRequest]):
+        items = [item for request in batch for item in request.items]
+
+        try:
+            # 한 요청이 max_batch_size보다 크면 나눠서 실행
+            results = []
+            for i in range(0, len(items), self.max_batch_size):
+                results.extend(self.run_batch(key, items[i:i + self.max_batch_size]))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(results[offset:offset + len(request.items)])
+            offset += len(request.items)
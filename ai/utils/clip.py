@@ -0,0 +1,207 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+import clip_interrogator.clip_interrogator as ci_module
+from clip_interrogator import Interrogator
+from clip_interrogator.clip_interrogator import LabelTable, _truncate_to_fit
+
+from core.config import settings
+from utils.zip import get_encoder_pool
+
+# clip_interrogator가 만드는 라벨 테이블 (fast / interrogate 모드는 negative를 제외한 5개를 합쳐서 사용)
+LABEL_TABLES = ("artists", "flavors", "mediums", "movements", "trendings", "negative")
+MERGED_LABEL_TABLES = ("artists", "flavors", "mediums", "movements", "trendings")
+
+
+class LabelBank:
+    # 라벨 텍스트 임베딩을 GPU에 한 번만 올려두고 이미지 특징과 한 번의 행렬곱으로 순위를 계산
+    # (clip_interrogator의 LabelTable은 rank를 호출할 때마다 numpy 배열을 다시 쌓아 GPU로 복사한다)
+
+    def __init__(self, labels: list[str], embeds: torch.Tensor):
+        self.labels = labels
+        self.embeds = embeds
+
+    @classmethod
+    def concat(cls, banks: list["LabelBank"]) -> "LabelBank":
+        labels = [label for bank in banks for label in bank.labels]
+        return cls(labels, torch.cat([bank.embeds for bank in banks]))
+
+    def rank(self, image_features: torch.Tensor, top_count: int = 1, reverse: bool = False) -> list[str]:
+        return self.rank_batch(image_features, top_count, reverse)[0]
+
+    def rank_batch(self, image_features: torch.Tensor, top_count: int = 1, reverse: bool = False) -> list[list[str]]:
+        # image_features: (이미지 수, dim), 배치 전체를 한 번의 행렬곱으로 계산
+        top_count = min(top_count, len(self.labels))
+
+        similarity = image_features.to(self.embeds.dtype) @ self.embeds.T
+        if reverse:
+            similarity = -similarity
+
+        _, top_labels = similarity.float().topk(top_count, dim=-1)
+        return [[self.labels[i] for i in row] for row in top_labels.tolist()]
+
+
+def get_label_bank_path(clip_model_name: str, desc: str, labels: list[str]) -> Path:
+    # 라벨 목록이 바뀌면 다른 파일을 쓰도록 해시를 파일 이름에 포함
+    labels_hash = hashlib.sha256(",".join(labels).encode()).hexdigest()[:16]
+    sanitized_name = clip_model_name.replace("/", "_").replace("@", "_")
+    return Path(settings.CLIP_CACHE_PATH) / f"{sanitized_name}_{desc}.{labels_hash}.npy"
+
+
+class PendingLabelTable:
+    # Interrogator 생성 시 LabelTable 대신 라벨 목록만 보관 (임베딩은 LabelBank가 .npy에서 읽음)
+
+    def __init__(self, labels: list[str], desc: str, ci: Interrogator):
+        self.labels = labels
+        self.desc = desc
+
+
+_label_table_lock = threading.Lock()
+
+
+@contextmanager
+def defer_label_tables():
+    # clip_interrogator는 생성자에서 모든 LabelTable의 임베딩을 읽거나 계산하므로,
+    # 생성하는 동안만 PendingLabelTable로 바꿔 LabelBank와 같은 테이블을 두 번 만들지 않게 함
+    with _label_table_lock:
+        ci_module.LabelTable = PendingLabelTable
+        try:
+            yield
+        finally:
+            ci_module.LabelTable = LabelTable
+
+
+def load_label_bank(interrogator: Interrogator, desc: str, table, device: torch.device) -> LabelBank:
+    path = get_label_bank_path(interrogator.config.clip_model_name, desc, table.labels)
+
+    if not path.exists():
+        # 처음 한 번만 LabelTable로 임베딩을 계산/다운로드해 .npy로 저장
+        if isinstance(table, PendingLabelTable):
+            table = LabelTable(table.labels, desc, interrogator)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.part")
+        with open(temp_path, "wb") as f:
+            np.save(f, np.stack(table.embeds).astype(np.float16))
+        os.replace(temp_path, path)
+
+    # memory-map으로 열어 같은 서버의 워커 프로세스들이 페이지 캐시를 공유하고, 재시작 시에도 바로 읽음
+    # (copy-on-write로 열어 복사 없이 텐서로 감싸고, GPU에는 mapped page에서 바로 한 번만 복사)
+    embeds = torch.from_numpy(np.load(path, mmap_mode="c"))
+    if device.type != "cpu":
+        embeds = embeds.to(device)
+    return LabelBank(list(table.labels), embeds)
+
+
+class ResidentInterrogator:
+    # 워커에 상주하는 CLIP Interrogator
+    # 라벨 테이블을 LabelBank로 바꿔두고, fast/best 모드에서 매번 테이블을 합치던 작업을 미리 합친 bank로 대신한다
+    # 이미지 특징 추출, BLIP caption 생성, 라벨 순위 계산은 여러 이미지를 한 번에 처리
+
+    def __init__(self, interrogator: Interrogator, device: torch.device):
+        self.interrogator = interrogator
+
+        for desc in LABEL_TABLES:
+            bank = load_label_bank(interrogator, desc, getattr(interrogator, desc), device)
+            setattr(interrogator, desc, bank)
+
+        self.merged = LabelBank.concat([getattr(interrogator, desc) for desc in MERGED_LABEL_TABLES])
+
+    @torch.no_grad()
+    def image_to_features(self, images: list[Image.Image]) -> torch.Tensor:
+        ci = self.interrogator
+        ci._prepare_clip()
+
+        # 전처리(resize/crop/normalize)는 CPU 작업이므로 스레드로 나눠서 처리
+        pixel_values = list(get_encoder_pool().map(ci.clip_preprocess, images))
+        pixel_values = torch.stack(pixel_values).to(ci.device)
+
+        with torch.cuda.amp.autocast():
+            image_features = ci.clip_model.encode_image(pixel_values)
+            image_features /= image_features.norm(dim=-1, keepdim=True)
+        return image_features
+
+    @torch.no_grad()
+    def generate_captions(self, images: list[Image.Image]) -> list[str]:
+        ci = self.interrogator
+        ci._prepare_caption()
+
+        inputs = ci.caption_processor(images=images, return_tensors="pt").to(ci.device)
+        if not ci.config.caption_model_name.startswith("git-"):
+            inputs = inputs.to(ci.dtype)
+
+        tokens = ci.caption_model.generate(**inputs, max_new_tokens=ci.config.caption_max_length)
+        return [caption.strip() for caption in ci.caption_processor.batch_decode(tokens, skip_special_tokens=True)]
+
+    def _classic_prompts(self, captions, image_features, max_flavors) -> list[str]:
+        ci = self.interrogator
+
+        mediums = ci.mediums.rank_batch(image_features, 1)
+        artists = ci.artists.rank_batch(image_features, 1)
+        trendings = ci.trendings.rank_batch(image_features, 1)
+        movements = ci.movements.rank_batch(image_features, 1)
+        flavors = ci.flavors.rank_batch(image_features, max_flavors)
+
+        prompts = []
+        for caption, medium, artist, trending, movement, flaves in zip(captions, mediums, artists, trendings, movements, flavors):
+            medium, artist, trending, movement, flaves = medium[0], artist[0], trending[0], movement[0], ", ".join(flaves)
+            if caption.startswith(medium):
+                prompt = f"{caption} {artist}, {trending}, {movement}, {flaves}"
+            else:
+                prompt = f"{caption}, {medium} {artist}, {trending}, {movement}, {flaves}"
+            prompts.append(_truncate_to_fit(prompt, ci.tokenize))
+        return prompts
+
+    def _fast_prompts(self, captions, image_features, max_flavors) -> list[str]:
+        tops = self.merged.rank_batch(image_features, max_flavors)
+        return [_truncate_to_fit(caption + ", " + ", ".join(top), self.interrogator.tokenize) for caption, top in zip(captions, tops)]
+
+    def _negative_prompts(self, image_features, max_flavors) -> list[str]:
+        ci = self.interrogator
+
+        flavors = ci.flavors.rank_batch(image_features, ci.config.flavor_intermediate_count, reverse=True)
+        # chain은 후보 프롬프트를 텍스트 인코더로 하나씩 비교하므로 이미지별로 실행
+        return [
+            ci.chain(image_features[i:i + 1], flaves + ci.negative.labels, max_count=max_flavors, reverse=True, desc="Negative chain")
+            for i, flaves in enumerate(flavors)
+        ]
+
+    def _best_prompts(self, captions, image_features, min_flavors, max_flavors) -> list[str]:
+        ci = self.interrogator
+
+        flavors = self.merged.rank_batch(image_features, ci.config.flavor_intermediate_count)
+        fast_prompts = self._fast_prompts(captions, image_features, max_flavors)
+        classic_prompts = self._classic_prompts(captions, image_features, max_flavors)
+
+        prompts = []
+        for i, (caption, flaves) in enumerate(zip(captions, flavors)):
+            features = image_features[i:i + 1]
+            best_prompt, best_sim = caption, ci.similarity(features, caption)
+            best_prompt = ci.chain(features, flaves, best_prompt, best_sim,
+                                   min_count=min_flavors, max_count=max_flavors, desc="Flavor chain")
+
+            candidates = [caption, classic_prompts[i], fast_prompts[i], best_prompt]
+            prompts.append(candidates[np.argmax(ci.similarities(features, candidates))])
+        return prompts
+
+    def interrogate_batch(self, images: list[Image.Image], mode=None, caption=None) -> list[str]:
+        # 모드별 기본값은 clip_interrogator의 interrogate* 메서드와 동일
+        image_features = self.image_to_features(images)
+
+        if mode == "negative":
+            return self._negative_prompts(image_features, max_flavors=32)
+
+        # caption을 직접 지정하지 않았으면 BLIP으로 배치 전체의 caption을 한 번에 생성
+        captions = [caption] * len(images) if caption else self.generate_captions(images)
+
+        if mode == "classic":
+            return self._classic_prompts(captions, image_features, max_flavors=3)
+        if mode == "fast":
+            return self._fast_prompts(captions, image_features, max_flavors=32)
+        return self._best_prompts(captions, image_features, min_flavors=8, max_flavors=32)
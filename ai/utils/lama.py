@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+import torch
+from PIL import Image
+from iopaint.model_manager import ModelManager
+from iopaint.schema import InpaintRequest
+
+from core.config import settings
+
+_inpaint_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_inpaint_pool() -> ThreadPoolExecutor:
+    # CPU 추론 시 이미지 여러 장을 동시에 처리 (torch 연산 중에는 GIL이 풀린다)
+    global _inpaint_pool
+    if _inpaint_pool is None:
+        _inpaint_pool = ThreadPoolExecutor(max_workers=settings.CLEANUP_WORKERS, thread_name_prefix="inpaint")
+    return _inpaint_pool
+
+
+class InpaintEngine:
+    # iopaint CLI(`iopaint run`)와 같은 모델/전처리를 워커 프로세스 안에서 직접 실행
+    # 요청마다 인터프리터를 새로 띄우고 모델을 로드하거나 PNG로 저장했다가 다시 읽지 않는다
+
+    def __init__(self, name: str, device: torch.device):
+        self.model_manager = ModelManager(name=name, device=device)
+        self.inpaint_request = InpaintRequest()
+
+    def inpaint(self, image: Image.Image, mask: Image.Image) -> Image.Image:
+        # iopaint CLI와 동일하게 알파 채널은 떼어 두었다가 결과에 다시 붙임 (RGBA -> PNG로 저장되어 투명도 유지)
+        alpha = image.convert("RGBA").getchannel("A")
+        image = np.asarray(image.convert("RGB"))
+
+        mask = mask.convert("L")
+        if mask.size != (image.shape[1], image.shape[0]):
+            mask = mask.resize((image.shape[1], image.shape[0]), Image.NEAREST)
+
+        # iopaint CLI와 동일하게 127을 기준으로 마스크를 이진화
+        mask = np.where(np.asarray(mask) >= 127, 255, 0).astype(np.uint8)
+
+        # 결과는 BGR로 반환된다
+        result = self.model_manager(image, mask, self.inpaint_request)
+        result = Image.fromarray(np.ascontiguousarray(result[:, :, ::-1]))
+
+        if alpha.size != result.size:
+            alpha = alpha.resize(result.size)
+        result.putalpha(alpha)
+        return result
+
+    def inpaint_batch(self, images: list[Image.Image], masks: list[Image.Image]) -> list[Image.Image]:
+        if settings.CLEANUP_WORKERS <= 1 or len(images) <= 1:
+            return [self.inpaint(image, mask) for image, mask in zip(images, masks)]
+
+        # map은 입력 순서대로 결과를 돌려준다
+        return list(get_inpaint_pool().map(self.inpaint, images, masks))
@@ -0,0 +1,76 @@
+import json
+import os
+import socket
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from utils.redis_client import get_redis_client
+
+TASK_COUNT_KEY = "metrics:task_count"
+PHASE_SECONDS_KEY = "metrics:phase_seconds"
+PEAK_MEMORY_KEY = "metrics:peak_memory"
+CACHE_STATS_KEY = "metrics:cache_stats"
+
+
+def get_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def record_task_metrics(metrics: Optional[dict]):
+    # 워커에서 측정한 값을 Redis에 누적해 API 서버의 /metrics에서 노출
+    if not metrics:
+        return
+
+    task = metrics["task"]
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.hincrby(TASK_COUNT_KEY, task, 1)
+        for phase, seconds in metrics["phases"].items():
+            pipe.hincrbyfloat(PHASE_SECONDS_KEY, f"{task}|{phase}", seconds)
+        if "peak_memory_allocated" in metrics:
+            pipe.hset(PEAK_MEMORY_KEY, f"{task}|{metrics['device']}", metrics["peak_memory_allocated"])
+        pipe.execute()
+    except RedisError as e:
+        print(f"Failed to record task metrics: {e}")
+
+
+def record_cache_stats(cache_name: str, stats: dict):
+    # 캐시 hit/miss 카운터는 워커 프로세스마다 따로 집계되므로 프로세스 단위로 저장
+    counters = {key: value for key, value in stats.items() if isinstance(value, (int, float))}
+    try:
+        get_redis_client().hset(CACHE_STATS_KEY, f"{cache_name}|{get_worker_name()}", json.dumps(counters))
+    except RedisError as e:
+        print(f"Failed to record cache stats: {e}")
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def render_metrics() -> str:
+    # Prometheus text exposition format
+    client = get_redis_client()
+    lines = []
+
+    lines.append("# TYPE defect_studio_task_total counter")
+    for task, count in client.hgetall(TASK_COUNT_KEY).items():
+        lines.append(f'defect_studio_task_total{{task="{_decode(task)}"}} {_decode(count)}')
+
+    lines.append("# TYPE defect_studio_task_phase_seconds_total counter")
+    for field, seconds in client.hgetall(PHASE_SECONDS_KEY).items():
+        task, phase = _decode(field).split("|", 1)
+        lines.append(f'defect_studio_task_phase_seconds_total{{task="{task}",phase="{phase}"}} {_decode(seconds)}')
+
+    lines.append("# TYPE defect_studio_task_peak_memory_bytes gauge")
+    for field, value in client.hgetall(PEAK_MEMORY_KEY).items():
+        task, device = _decode(field).split("|", 1)
+        lines.append(f'defect_studio_task_peak_memory_bytes{{task="{task}",device="{device}"}} {_decode(value)}')
+
+    lines.append("# TYPE defect_studio_cache_events_total counter")
+    for field, value in client.hgetall(CACHE_STATS_KEY).items():
+        cache, worker = _decode(field).split("|", 1)
+        for name, count in json.loads(value).items():
+            lines.append(f'defect_studio_cache_events_total{{cache="{cache}",worker="{worker}",event="{name}"}} {count}')
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,183 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import torch
+from clip_interrogator import Interrogator, Config
+from fastapi import HTTPException
+
+from core.config import settings
+from utils.clip import ResidentInterrogator, defer_label_tables
+from utils.lama import InpaintEngine
+from utils.pipeline import resolve_device
+from utils.rmbg import RemoveBackgroundEngine
+
+
+@dataclass
+class ResidentModelEntry:
+    model: Any
+    size: int           # 모델이 가진 가중치/텐서의 메모리 (byte)
+
+
+def get_model_memory(model, depth: int = 3) -> int:
+    # 엔진 객체의 속성을 따라가며 nn.Module 가중치와 텐서(라벨 임베딩 등)의 크기를 합산 (공유된 텐서는 한 번만)
+    seen = set()
+
+    def measure(obj, depth):
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+
+        if isinstance(obj, torch.Tensor):
+            return obj.numel() * obj.element_size()
+        if isinstance(obj, torch.nn.Module):
+            return sum(measure(t, 0) for t in (*obj.parameters(), *obj.buffers()))
+        if depth <= 0:
+            return 0
+        if isinstance(obj, (list, tuple)):
+            return sum(measure(item, depth - 1) for item in obj)
+        if isinstance(obj, dict):
+            return sum(measure(item, depth - 1) for item in obj.values())
+        if hasattr(obj, "__dict__"):
+            return sum(measure(item, depth - 1) for item in vars(obj).values())
+        return 0
+
+    return measure(model, depth)
+
+
+class ResidentModelCache:
+    # 파이프라인 캐시에 들어가지 않는 CLIP Interrogator, RMBG 같은 모델을 (종류, 이름, device) 단위로 상주
+    # 요청마다 모델을 새로 올리고 지우는 대신 워커 프로세스가 살아있는 동안 재사용한다
+    # 디바이스별 메모리 상한을 넘으면 오래된 것부터 제거하고, 로드는 lock 밖에서 key별로 한 스레드만 진행
+
+    def __init__(self, max_memory_mb: int):
+        self.max_memory = max_memory_mb * (1024 ** 2)
+        self._entries: "OrderedDict[tuple, ResidentModelEntry]" = OrderedDict()
+        self._loading: dict[tuple, Future] = {}
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind: str, name: str, device, loader: Callable[[str, torch.device], Any]):
+        device = resolve_device(device)
+        key = (kind, name, str(device))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.model
+
+            loading = self._loading.get(key)
+            owner = loading is None
+            if owner:
+                self.misses += 1
+                loading = self._loading[key] = Future()
+
+        if not owner:
+            # 같은 모델을 다른 스레드가 로드하는 중이면 그 결과를 함께 사용
+            return loading.result()
+
+        try:
+            model = loader(name, device)
+            entry = ResidentModelEntry(model, get_model_memory(model))
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            self._loading.pop(key, None)
+            if self.max_memory > 0:
+                self._make_room(str(device), entry.size)
+                self._entries[key] = entry
+
+        loading.set_result(model)
+        return model
+
+    def _make_room(self, device: str, size: int):
+        # 같은 디바이스에 올라간 모델만 상한 계산에 포함
+        while True:
+            device_keys = [key for key in self._entries if key[2] == device]
+            used = sum(self._entries[key].size for key in device_keys)
+
+            if not device_keys or used + size <= self.max_memory:
+                return
+
+            self._entries.pop(device_keys[0])
+            self.evictions += 1
+
+    def resident_models(self, device) -> list[str]:
+        device = str(resolve_device(device))
+        with self._lock:
+            return sorted({key[1] for key in self._entries if key[2] == device})
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": [
+                    {"kind": key[0], "model": key[1], "device": key[2], "size": entry.size}
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+
+def load_clip_interrogator(clip_model_name: str, device: torch.device) -> ResidentInterrogator:
+    if device.type != "cuda":
+        raise HTTPException(status_code=400, detail="CLIP API ERROR: GPU is not available.")
+
+    # Interrogator는 device가 "cuda"일 때만 fp16 입력을 만들기 때문에 index 없이 현재 GPU(호출 측에서 set_device)를 사용
+    torch.cuda.set_device(device)
+    clip_config = Config(
+        clip_model_name=clip_model_name,
+        cache_path=settings.CLIP_CACHE_PATH,
+    )
+    clip_config.apply_low_vram_defaults()
+    clip_config.chunk_size = settings.CLIP_CHUNK_SIZE
+
+    # 상주시키는 모델이므로 요청마다 CPU <-> GPU로 옮기지 않음
+    clip_config.caption_offload = False
+    clip_config.clip_offload = False
+
+    # 라벨 테이블은 ResidentInterrogator가 LabelBank로 한 번만 읽음
+    with defer_label_tables():
+        clip_interrogator = Interrogator(clip_config)
+    clip_interrogator.clip_model = clip_interrogator.clip_model.half()
+    clip_interrogator.caption_model = clip_interrogator.caption_model.half()
+    return ResidentInterrogator(clip_interrogator, device)
+
+
+def load_rmbg_engine(model: str, device: torch.device) -> RemoveBackgroundEngine:
+    return RemoveBackgroundEngine(model, device)
+
+
+def load_inpaint_engine(model: str, device: torch.device) -> InpaintEngine:
+    return InpaintEngine(model, device)
+
+
+model_cache = ResidentModelCache(settings.MODEL_CACHE_MAX_MEMORY_MB)
+
+
+def get_clip_interrogator(clip_model_name: str, device) -> ResidentInterrogator:
+    return model_cache.get("clip", clip_model_name, device, load_clip_interrogator)
+
+
+def get_rmbg_engine(model: str, device) -> RemoveBackgroundEngine:
+    return model_cache.get("rmbg", model, device, load_rmbg_engine)
+
+
+def get_inpaint_engine(model: str, device) -> InpaintEngine:
+    return model_cache.get("inpaint", model, device, load_inpaint_engine)
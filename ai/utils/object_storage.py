@@ -0,0 +1,69 @@
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+
+
+def get_result_upload(form) -> Optional[dict]:
+    # backend가 넘겨준 presigned POST ({"url", "fields", "key_prefix", "url_base"}), 없으면 결과를 ZIP으로 전달
+    result_upload = form.get("result_upload")
+    return json.loads(result_upload) if result_upload else None
+
+
+def is_uploaded_result(result) -> bool:
+    return isinstance(result, dict) and result.get("result_type") == "urls"
+
+
+def _upload_entry(client: httpx.Client, result_upload: dict, zip_path: str, index: int, name: str) -> tuple[str, int]:
+    extension = PurePosixPath(name).suffix.lstrip(".")
+    key = f"{result_upload['key_prefix']}/{index}.{extension}"
+
+    # ZIP_STORED이므로 엔트리 하나만 읽어 그대로 전송
+    with zipfile.ZipFile(zip_path) as zip_file:
+        data = zip_file.read(name)
+
+    response = client.post(
+        result_upload["url"],
+        data={**result_upload["fields"], "key": key, "Content-Type": f"image/{extension}"},
+        files={"file": (PurePosixPath(key).name, data, f"image/{extension}")},
+    )
+    response.raise_for_status()
+    return f"{result_upload['url_base']}/{key}", len(data)
+
+
+def upload_result_archive(result_archive: dict, result_upload: dict) -> dict:
+    # 워커가 결과 이미지를 오브젝트 스토리지에 직접 올리고, task 결과에는 URL과 크기만 남김
+    # (이미지가 Redis / AI API / backend를 거치지 않음)
+    zip_path = result_archive["path"]
+    with zipfile.ZipFile(zip_path) as zip_file:
+        names = [info.filename for info in zip_file.infolist() if not info.is_dir()]
+
+    try:
+        with httpx.Client(timeout=settings.RESULT_UPLOAD_TIMEOUT) as client, \
+                ThreadPoolExecutor(max_workers=settings.RESULT_UPLOAD_WORKERS) as pool:
+            uploaded = list(pool.map(
+                lambda item: _upload_entry(client, result_upload, zip_path, item[0], item[1]),
+                enumerate(names, start=1),
+            ))
+    except (httpx.HTTPError, OSError) as e:
+        # 업로드에 실패하면 기존처럼 backend가 ZIP을 받아 업로드하도록 결과를 그대로 둠
+        print(f"Failed to upload results to object storage: {e}")
+        return result_archive
+
+    os.remove(zip_path)
+
+    result = {
+        "result_type": "urls",
+        "urls": [url for url, _ in uploaded],
+        "sizes": [size for _, size in uploaded],
+        "num_of_images": len(uploaded),
+    }
+    if "metrics" in result_archive:
+        result["metrics"] = result_archive["metrics"]
+    return result
@@ -0,0 +1,224 @@
+import copy
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import torch
+from diffusers import StableDiffusionPipeline
+
+from core.config import settings
+
+
+@dataclass
+class PipelineCacheEntry:
+    pipe: Any           # 캐시에만 보관하고 task에는 넘기지 않음 (task에는 make_pipeline_view로 만든 사본을 전달)
+    scheduler: Any      # 로드 시점의 기본 scheduler (task마다 같은 설정으로 새로 생성)
+    size: int           # 파이프라인이 차지하는 메모리 (byte), 가중치를 공유하는 파생 파이프라인은 0
+    revision: Optional[int]
+    base_key: Optional[tuple] = None  # 파생 파이프라인이면 가중치를 빌려온 기본 파이프라인의 key
+
+
+def resolve_device(device) -> torch.device:
+    device = torch.device(device)
+
+    # "cuda"처럼 index가 없으면 현재 선택된 GPU로 고정해야 디바이스별로 캐시가 나뉜다
+    if device.type == "cuda" and device.index is None:
+        device = torch.device("cuda", torch.cuda.current_device())
+    return device
+
+
+def get_checkpoint_revision(model_path) -> Optional[int]:
+    # 같은 경로에 모델이 재학습되어 저장되면 model_index.json이 새로 써지므로 수정 시각으로 버전을 구분
+    model_path = Path(model_path)
+    for path in (model_path / "model_index.json", model_path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+    return None
+
+
+def get_pipeline_memory(pipe) -> int:
+    total = 0
+    for component in pipe.components.values():
+        if isinstance(component, torch.nn.Module):
+            total += sum(t.numel() * t.element_size() for t in component.parameters())
+            total += sum(t.numel() * t.element_size() for t in component.buffers())
+    return total
+
+
+def compose_pipeline(pipeline_cls, base_pipe):
+    # 이미 올라가 있는 txt2img 파이프라인의 UNet/VAE/텍스트 인코더를 그대로 넘겨 다른 모드의 파이프라인을 구성
+    if hasattr(pipeline_cls, "from_pipe"):
+        # AutoPipelineFor* 계열은 원본 파이프라인에 맞는 클래스를 골라주고 설정도 그대로 옮겨준다
+        return pipeline_cls.from_pipe(base_pipe)
+
+    kwargs = dict(base_pipe.components)
+    if "requires_safety_checker" in inspect.signature(pipeline_cls.__init__).parameters:
+        kwargs["requires_safety_checker"] = base_pipe.config.get("requires_safety_checker", True)
+    return pipeline_cls(**kwargs)
+
+
+def make_pipeline_view(pipe, scheduler):
+    # 가중치 모듈(UNet/VAE/텍스트 인코더)과 설정은 공유하고, 디노이징 상태를 가진 scheduler와
+    # 호출 중에 설정되는 속성(_guidance_scale 등)만 task마다 분리
+    # 파이프라인을 다시 생성하지 않고 얕은 복사 후 scheduler만 교체 (config는 교체 시 사본에만 새로 써짐)
+    view = copy.copy(pipe)
+    view.scheduler = scheduler.__class__.from_config(scheduler.config)
+    return view
+
+
+class PipelineCache:
+    # 워커 프로세스에 상주하는 파이프라인 LRU 캐시
+    # key: (모델 경로, 파이프라인 클래스, dtype, device), 디바이스별 메모리 상한을 넘으면 오래된 것부터 제거
+    # 가중치는 체크포인트마다 txt2img 파이프라인으로 한 번만 로드하고, img2img/inpainting은 이를 공유해 구성한다
+    # --pool=threads 워커에서는 여러 task가 같은 체크포인트를 동시에 쓰므로, 캐시된 인스턴스는 수정하지 않고
+    # get()마다 가중치와 설정을 공유하고 scheduler만 새로 만든 사본을 돌려준다
+
+    def __init__(self, max_memory_mb: int):
+        self.max_memory = max_memory_mb * (1024 ** 2)
+        self._entries: "OrderedDict[tuple, PipelineCacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading: dict[tuple, Future] = {}
+        self._eviction_listeners = []
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def add_eviction_listener(self, listener):
+        # 기본 파이프라인이 캐시에서 빠질 때 모델 경로와 함께 호출 (프롬프트 임베딩 캐시 정리 등)
+        self._eviction_listeners.append(listener)
+
+    def get(self, pipeline_cls, model_path, torch_dtype=torch.float16, device="cuda"):
+        # 전역 lock은 캐시 목록을 고칠 때만 잡고, 로드는 key별로 한 스레드만 진행 (다른 모델의 캐시 hit는 기다리지 않음)
+        device = resolve_device(device)
+        base_key, base_entry = self._get_base(model_path, torch_dtype, device)
+
+        if pipeline_cls is StableDiffusionPipeline:
+            return self._checkout(base_key, base_entry)
+
+        key = (str(model_path), pipeline_cls.__name__, str(torch_dtype), str(device))
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None or entry.revision != base_entry.revision:
+            # 같은 가중치를 공유하므로 추가 VRAM이나 로드 시간이 들지 않는다 (모델/파이프라인 클래스마다 한 번만 구성)
+            pipe = compose_pipeline(pipeline_cls, base_entry.pipe)
+            entry = PipelineCacheEntry(pipe, pipe.scheduler, 0, base_entry.revision, base_key)
+
+            with self._lock:
+                # 그 사이 기본 파이프라인이 제거되었으면 파생 파이프라인도 보관하지 않음
+                if self.max_memory > 0 and base_key in self._entries:
+                    self._entries[key] = entry
+
+        return self._checkout(key, entry)
+
+    def _get_base(self, model_path, torch_dtype, device):
+        key = (str(model_path), StableDiffusionPipeline.__name__, str(torch_dtype), str(device))
+        revision = get_checkpoint_revision(model_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.revision == revision:
+                self.hits += 1
+                return key, entry
+
+            loading = self._loading.get(key)
+            owner = loading is None
+            if owner:
+                if entry is not None:
+                    # 재학습 등으로 체크포인트가 바뀐 경우
+                    self._evict(key)
+
+                self.misses += 1
+                loading = self._loading[key] = Future()
+
+        if not owner:
+            # 같은 파이프라인을 다른 스레드가 로드하는 중이면 그 결과를 함께 사용
+            return key, loading.result()
+
+        try:
+            pipe = StableDiffusionPipeline.from_pretrained(model_path, torch_dtype=torch_dtype).to(device)
+            entry = PipelineCacheEntry(pipe, pipe.scheduler, get_pipeline_memory(pipe), revision)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            self._loading.pop(key, None)
+            if self.max_memory > 0:
+                self._make_room(str(device), entry.size)
+                self._entries[key] = entry
+
+        loading.set_result(entry)
+        return key, entry
+
+    def _checkout(self, key, entry: PipelineCacheEntry):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                if entry.base_key in self._entries:
+                    self._entries.move_to_end(entry.base_key)
+
+        return make_pipeline_view(entry.pipe, entry.scheduler)
+
+    def _make_room(self, device: str, size: int):
+        # 같은 디바이스에 올라간 파이프라인만 상한 계산에 포함
+        while True:
+            device_keys = [key for key in self._entries if key[3] == device]
+            used = sum(self._entries[key].size for key in device_keys)
+
+            if not device_keys or used + size <= self.max_memory:
+                return
+
+            self._evict(device_keys[0])
+
+    def _evict(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.evictions += 1
+
+        # 기본 파이프라인이 빠지면 가중치를 공유하던 파생 파이프라인도 함께 제거
+        for derived_key in [k for k, e in self._entries.items() if e.base_key == key]:
+            self._entries.pop(derived_key, None)
+
+        if entry.base_key is None:
+            for listener in self._eviction_listeners:
+                listener(key[0])
+
+    def clear(self):
+        with self._lock:
+            models = {key[0] for key, entry in self._entries.items() if entry.base_key is None}
+            self._entries.clear()
+            for model_path in models:
+                for listener in self._eviction_listeners:
+                    listener(model_path)
+
+    def resident_models(self, device) -> list[str]:
+        device = str(resolve_device(device))
+        with self._lock:
+            return sorted({key[0] for key in self._entries if key[3] == device})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": [
+                    {"model": key[0], "pipeline": key[1], "dtype": key[2], "device": key[3], "size": entry.size}
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+
+pipeline_cache = PipelineCache(settings.PIPELINE_CACHE_MAX_MEMORY_MB)
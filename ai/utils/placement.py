@@ -0,0 +1,152 @@
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import nvidia_smi
+import torch
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from core.config import settings
+from utils.redis_client import get_redis_client
+
+AUTO_DEVICE = "auto"
+RESIDENT_MODELS_KEY = "placement:resident:{device}"
+
+
+def get_device_queue(device: int) -> str:
+    # GPU마다 전용 큐를 두고, 각 워커는 자신이 담당하는 GPU의 큐만 소비한다
+    # 예) celery -A workers.celery worker -Q gen_queue_1 --hostname gpu1@%h
+    return f"{settings.GEN_QUEUE_PREFIX}_{device}"
+
+
+_consumed_queues: set[str] = set()
+_consumed_queues_checked_at = 0.0
+_consumed_queues_lock = threading.Lock()
+
+
+def get_consumed_queues(app) -> set[str]:
+    # 현재 실행 중인 워커들이 소비하는 큐 목록 (broadcast 비용이 있으므로 일정 시간 동안 재사용)
+    # 다른 요청이 갱신 중이면 기다리지 않고 이전 목록을 사용
+    global _consumed_queues, _consumed_queues_checked_at
+
+    if time.monotonic() - _consumed_queues_checked_at < settings.PLACEMENT_QUEUE_CHECK_INTERVAL:
+        return _consumed_queues
+    if not _consumed_queues_lock.acquire(blocking=False):
+        return _consumed_queues
+
+    try:
+        try:
+            replies = app.control.inspect(timeout=settings.PLACEMENT_INSPECT_TIMEOUT).active_queues() or {}
+        except Exception as e:
+            print(f"Failed to inspect worker queues: {e}")
+            replies = {}
+
+        _consumed_queues = {queue["name"] for queues in replies.values() for queue in queues}
+        _consumed_queues_checked_at = time.monotonic()
+        return _consumed_queues
+    finally:
+        _consumed_queues_lock.release()
+
+
+def get_task_queue(app, device: int) -> str:
+    # 해당 GPU 전용 워커가 없으면 공용 큐(gen_queue)로 보냄 (task가 gpu_device로 GPU를 직접 선택하므로 결과는 같다)
+    device_queue = get_device_queue(device)
+    if device_queue in get_consumed_queues(app):
+        return device_queue
+    return settings.GEN_QUEUE_PREFIX
+
+
+def get_device_count() -> int:
+    return torch.cuda.device_count()
+
+
+def get_model_name(model) -> str:
+    # 워커의 파이프라인 캐시는 OUTPUT_DIR 기준 전체 경로를 key로 쓰므로 상대 경로로 맞춰 비교
+    model_path = Path(str(model))
+    try:
+        return model_path.relative_to(settings.OUTPUT_DIR).as_posix()
+    except ValueError:
+        return model_path.as_posix()
+
+
+def publish_resident_models(device: torch.device, models: list[str]):
+    # 워커가 현재 GPU에 올라가 있는 모델 목록을 알려두면 API 서버가 배치할 때 참고한다
+    if device.type != "cuda":
+        return
+
+    key = RESIDENT_MODELS_KEY.format(device=device.index)
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.delete(key)
+        if models:
+            pipe.sadd(key, *[get_model_name(model) for model in models])
+            # 워커가 죽으면 갱신이 멈추므로 일정 시간이 지나면 무시
+            pipe.expire(key, settings.PLACEMENT_RESIDENT_TTL)
+        pipe.execute()
+    except RedisError as e:
+        print(f"Failed to publish resident models: {e}")
+
+
+def get_resident_devices(model) -> set[int]:
+    model_name = get_model_name(model)
+    client = get_redis_client()
+
+    devices = set()
+    for device in range(get_device_count()):
+        if client.sismember(RESIDENT_MODELS_KEY.format(device=device), model_name):
+            devices.add(device)
+    return devices
+
+
+def get_device_loads() -> dict[int, tuple[int, float]]:
+    # GPU별 (큐에 대기 중인 작업 수, 메모리 사용률)
+    client = get_redis_client()
+
+    nvidia_smi.nvmlInit()
+    try:
+        loads = {}
+        for device in range(nvidia_smi.nvmlDeviceGetCount()):
+            handle = nvidia_smi.nvmlDeviceGetHandleByIndex(device)
+            info = nvidia_smi.nvmlDeviceGetMemoryInfo(handle)
+            queued = client.llen(get_device_queue(device))
+            loads[device] = (queued, info.used / info.total)
+        return loads
+    finally:
+        nvidia_smi.nvmlShutdown()
+
+
+def select_device(gpu_device, model: Optional[str] = None) -> int:
+    device_count = get_device_count()
+    if device_count == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="사용 가능한 GPU가 없습니다.")
+
+    if gpu_device is not None and str(gpu_device) != AUTO_DEVICE:
+        device = int(gpu_device)
+        if device < 0 or device >= device_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"GPU 장치 번호는 0 ~ {device_count - 1} 사이여야 합니다."
+            )
+        return device
+
+    loads = get_device_loads()
+    candidates = list(loads)
+
+    # 모델이 이미 올라가 있는 GPU가 있으면 로드 시간을 아낄 수 있으므로 그 중에서 고른다
+    if model is not None:
+        resident_devices = get_resident_devices(model) & set(candidates)
+        if resident_devices:
+            candidates = list(resident_devices)
+
+    return min(candidates, key=lambda device: loads[device])
+
+
+def apply_async_on_device(task, form_data: dict, model: Optional[str] = None):
+    # gpu_device가 "auto"면 배치 정책에 따라 GPU를 정하고, 해당 GPU의 큐로 보낸다
+    # (워커 inspect / NVML / Redis 호출이 blocking이므로 async 라우트에서는 run_in_threadpool로 호출)
+    device = select_device(form_data.get("gpu_device"), model)
+    form_data["gpu_device"] = device
+
+    return task.apply_async(kwargs=form_data, queue=get_task_queue(task.app, device))
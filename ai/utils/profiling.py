@@ -0,0 +1,144 @@
+import gc
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+import torch
+
+from core.config import settings
+
+_local = threading.local()
+
+
+def _synchronize(device: Optional[torch.device]):
+    # CUDA 연산은 비동기이므로 구간 경계에서 동기화해야 실제 소요 시간이 측정된다
+    if device is not None and device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+class TaskProfiler:
+    # task의 구간별 소요 시간(load, encode_prompt, denoise, vae_decode, encode_zip 등)과 최대 GPU 메모리를 기록
+    # PROFILING_ENABLED가 꺼져 있으면 아무것도 측정하지 않는다
+
+    def __init__(self, task_name: str, device: Optional[torch.device] = None):
+        self.task_name = task_name
+        self.device = device
+        self.enabled = settings.PROFILING_ENABLED
+        self.phases = defaultdict(float)
+        self._started_at = None
+        # 모듈 hook 구간의 시작 시각 (모듈은 여러 task가 공유하므로 task별 profiler에 보관)
+        self._hook_started_at: dict[str, float] = {}
+
+    def __enter__(self):
+        if self.enabled:
+            if self.device is not None and self.device.type == "cuda":
+                torch.cuda.reset_peak_memory_stats(self.device)
+            self._started_at = time.perf_counter()
+            _local.profiler = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.enabled:
+            _synchronize(self.device)
+            self.phases["total"] = time.perf_counter() - self._started_at
+            _local.profiler = None
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        _synchronize(self.device)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _synchronize(self.device)
+            self.phases[name] += time.perf_counter() - start
+
+    def to_dict(self) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        metrics = {
+            "task": self.task_name,
+            "device": str(self.device),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+        }
+        if self.device is not None and self.device.type == "cuda":
+            metrics["peak_memory_allocated"] = torch.cuda.max_memory_allocated(self.device)
+            metrics["peak_memory_reserved"] = torch.cuda.max_memory_reserved(self.device)
+        return metrics
+
+
+def get_current_profiler() -> Optional[TaskProfiler]:
+    return getattr(_local, "profiler", None)
+
+
+def _register_phase_hooks(module: torch.nn.Module, name: str):
+    if module is None or getattr(module, "_profiling_phase", None) == name:
+        return
+    module._profiling_phase = name
+
+    def pre_hook(*_):
+        profiler = get_current_profiler()
+        if profiler is not None:
+            _synchronize(profiler.device)
+            profiler._hook_started_at[name] = time.perf_counter()
+
+    def post_hook(*_):
+        profiler = get_current_profiler()
+        started_at = profiler._hook_started_at.pop(name, None) if profiler is not None else None
+        if started_at is not None:
+            _synchronize(profiler.device)
+            profiler.phases[name] += time.perf_counter() - started_at
+
+    module.register_forward_pre_hook(pre_hook)
+    module.register_forward_hook(post_hook)
+
+
+def instrument_pipeline(pipe):
+    # 파이프라인 내부 모듈에 hook을 걸어 한 번의 호출을 prompt 인코딩 / 디노이징 / VAE 구간으로 나눠 측정
+    # hook은 현재 스레드에서 실행 중인 profiler에만 기록하므로, 측정하지 않는 호출에는 영향이 없다
+    if not settings.PROFILING_ENABLED:
+        return
+
+    _register_phase_hooks(getattr(pipe, "text_encoder", None), "encode_prompt")
+    _register_phase_hooks(getattr(pipe, "unet", None), "denoise")
+
+    vae = getattr(pipe, "vae", None)
+    if vae is not None:
+        _register_phase_hooks(vae.encoder, "vae_encode")
+        _register_phase_hooks(vae.decoder, "vae_decode")
+
+
+def release_cuda_memory(device: Optional[torch.device] = None):
+    # 캐시된 메모리를 비우면 다음 작업에서 할당을 다시 해야 하므로 정책에 따라서만 해제
+    policy = settings.CUDA_MEMORY_RELEASE_POLICY
+    if policy == "never" or not torch.cuda.is_available():
+        return
+
+    if policy == "threshold":
+        device = device if device is not None else torch.device("cuda", torch.cuda.current_device())
+        total_memory = torch.cuda.get_device_properties(device).total_memory
+        if torch.cuda.memory_reserved(device) < total_memory * settings.CUDA_MEMORY_RELEASE_THRESHOLD:
+            return
+
+    gc.collect()
+    torch.cuda.empty_cache()
+    torch.cuda.ipc_collect()
+
+
+@contextmanager
+def profile_phase(name: str):
+    # 현재 스레드에서 실행 중인 profiler가 있을 때만 구간을 기록 (dynamic batching 스레드 등에서는 무시)
+    profiler = get_current_profiler()
+    if profiler is None:
+        yield
+        return
+
+    with profiler.phase(name):
+        yield
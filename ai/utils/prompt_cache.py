@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+
+import torch
+
+from core.config import settings
+from utils.pipeline import get_checkpoint_revision, pipeline_cache
+
+
+class PromptEmbeddingCache:
+    # 자주 쓰는 프롬프트/negative 프롬프트의 텍스트 인코더 출력을 재사용
+    # key: (모델 경로, 체크포인트 revision, 프롬프트)
+    # 체크포인트가 다시 저장되거나 PipelineCache에서 모델이 빠지면 해당 모델의 임베딩을 모두 버린다
+
+    def __init__(self, max_memory_mb: int):
+        self.max_memory = max_memory_mb * (1024 ** 2)
+        self._entries: "OrderedDict[tuple, torch.Tensor]" = OrderedDict()
+        self._revisions: dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def encode(self, pipe, model_path, prompts: list[str]) -> torch.Tensor:
+        # 프롬프트마다 (1, 토큰 수, dim) 임베딩을 만들어 (len(prompts), 토큰 수, dim)으로 반환
+        if self.max_memory <= 0:
+            return self._encode(pipe, prompts)
+
+        model_path = str(model_path)
+
+        with self._lock:
+            revision = self._check_revision(model_path)
+            keys = [(model_path, revision, prompt) for prompt in prompts]
+
+            found = {key: self._entries[key] for key in keys if key in self._entries}
+            missing = list(dict.fromkeys(key[2] for key in keys if key not in found))
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += len(keys) - sum(1 for key in keys if key in found)
+
+            if missing:
+                # 처음 보는 프롬프트는 한 번의 텍스트 인코더 호출로 함께 계산
+                embeds = self._encode(pipe, missing)
+                for prompt, embed in zip(missing, embeds.split(1)):
+                    key = (model_path, revision, prompt)
+                    found[key] = embed
+                    self._put(key, embed)
+
+            for key in found:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return torch.cat([found[key] for key in keys])
+
+    @staticmethod
+    def _encode(pipe, prompts: list[str]) -> torch.Tensor:
+        # 빈 문자열("")의 임베딩은 negative prompt가 없을 때 쓰이는 unconditional 임베딩과 같다
+        # 캐시에 오래 남으므로 autograd 상태 없이 계산
+        with torch.inference_mode():
+            prompt_embeds, _ = pipe.encode_prompt(prompts, pipe._execution_device, 1, False)
+        return prompt_embeds.detach()
+
+    def _check_revision(self, model_path: str):
+        # 이전 revision의 임베딩은 더 이상 조회되지 않으므로 바로 제거
+        revision = get_checkpoint_revision(model_path)
+        if self._revisions.get(model_path, revision) != revision:
+            self.invalidate(model_path)
+        self._revisions[model_path] = revision
+        return revision
+
+    def _put(self, key, embed: torch.Tensor):
+        size = embed.numel() * embed.element_size()
+        while self._entries and self._size + size > self.max_memory:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.numel() * evicted.element_size()
+            self.evictions += 1
+
+        self._entries[key] = embed
+        self._size += size
+
+    def invalidate(self, model_path):
+        # 재학습 등으로 체크포인트가 바뀌었거나 PipelineCache에서 빠진 모델의 임베딩만 제거
+        model_path = str(model_path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == model_path]:
+                embed = self._entries.pop(key)
+                self._size -= embed.numel() * embed.element_size()
+            self._revisions.pop(model_path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._revisions.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
+
+
+prompt_cache = PromptEmbeddingCache(settings.PROMPT_EMBED_CACHE_MAX_MB)
+pipeline_cache.add_eviction_listener(prompt_cache.invalidate)
@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from core.config import settings
+from utils.metrics import get_worker_name
+from utils.redis_client import get_redis_client
+
+# 워커마다 별도의 key에 TTL을 두고 저장 (종료 신호 없이 죽은 워커는 heartbeat가 멈춰 자동으로 사라짐)
+READINESS_KEY = "readiness:worker:{worker}"
+
+_readiness: Optional[dict] = None
+_heartbeat_started = False
+_heartbeat_lock = threading.Lock()
+
+
+def _store_readiness(readiness: dict):
+    try:
+        get_redis_client().setex(READINESS_KEY.format(worker=get_worker_name()),
+                                 settings.READINESS_TTL, json.dumps(readiness))
+    except RedisError as e:
+        print(f"Failed to report worker readiness: {e}")
+
+
+def set_worker_readiness(device, state: str, models: Optional[list[str]] = None, error: Optional[str] = None):
+    # state: warming | ready | failed
+    global _readiness
+
+    readiness = {
+        "device": str(device),
+        "state": state,
+        "models": models or [],
+        "updated_at": time.time(),
+    }
+    if error is not None:
+        readiness["error"] = error
+
+    _readiness = readiness
+    _store_readiness(readiness)
+    start_readiness_heartbeat()
+
+
+def _heartbeat():
+    while True:
+        time.sleep(settings.READINESS_HEARTBEAT_INTERVAL)
+        if _readiness is not None:
+            _store_readiness({**_readiness, "heartbeat_at": time.time()})
+
+
+def start_readiness_heartbeat():
+    # 프로세스가 살아 있는 동안 TTL을 갱신 (daemon 스레드이므로 프로세스가 죽으면 함께 멈춤)
+    global _heartbeat_started
+
+    with _heartbeat_lock:
+        if _heartbeat_started:
+            return
+        _heartbeat_started = True
+
+    threading.Thread(target=_heartbeat, name="readiness-heartbeat", daemon=True).start()
+
+
+def clear_worker_readiness():
+    global _readiness
+
+    _readiness = None
+    try:
+        get_redis_client().delete(READINESS_KEY.format(worker=get_worker_name()))
+    except RedisError as e:
+        print(f"Failed to clear worker readiness: {e}")
+
+
+def get_worker_readiness() -> dict:
+    client = get_redis_client()
+    keys = list(client.scan_iter(match=READINESS_KEY.format(worker="*")))
+    if not keys:
+        return {}
+
+    prefix = READINESS_KEY.format(worker="")
+    return {
+        key.decode()[len(prefix):]: json.loads(readiness)
+        for key, readiness in zip(keys, client.mget(keys))
+        # scan과 mget 사이에 만료된 key는 제외
+        if readiness is not None
+    }
@@ -0,0 +1,15 @@
+from typing import Optional
+
+import redis
+
+from core.config import settings
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis_client() -> redis.Redis:
+    # 워커/API 프로세스마다 하나의 커넥션 풀을 재사용
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(host=settings.REDIS_HOST, port=int(settings.REDIS_PORT), db=0)
+    return _redis_client
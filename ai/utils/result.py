@@ -0,0 +1,103 @@
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from utils.profiling import profile_phase
+from utils.task_events import publish_task_progress
+from utils.zip import ImageZipWriter
+
+SWEEP_INTERVAL = 600
+
+_last_sweep = 0.0
+
+
+def get_result_archive_path(task_id: str) -> Path:
+    return Path(settings.RESULT_DIR) / f"{task_id}.zip"
+
+
+class ResultArchive:
+    # 결과 ZIP은 공유 디스크(spool)에 쓰고, Result Backend(Redis)에는 위치 정보만 저장
+    # 배치가 끝날 때마다 add()로 넘기면 다음 배치를 생성하는 동안 인코딩과 기록이 진행된다
+
+    def __init__(self, task_id: str, total: Optional[int] = None):
+        self.path = get_result_archive_path(task_id)
+        # total을 알려주면 add()마다 진행 상황 이벤트를 보냄
+        self.total = total
+        self.completed = 0
+        # 작성 중인 파일을 API 서버가 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿈
+        self.temp_path = self.path.with_name(self.path.name + ".part")
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.temp_path, "wb")
+        self._writer = ImageZipWriter(self._file)
+        return self
+
+    def add(self, image_list: list[Image.Image]):
+        with profile_phase("encode_zip"):
+            self._writer.add(image_list)
+
+        self.completed += len(image_list)
+        if self.total:
+            publish_task_progress(self.completed, self.total)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            try:
+                with profile_phase("encode_zip"):
+                    self._writer.close()
+            finally:
+                self._file.close()
+        except Exception:
+            self.temp_path.unlink(missing_ok=True)
+            raise
+
+        if exc_type is not None:
+            self.temp_path.unlink(missing_ok=True)
+            return
+
+        os.replace(self.temp_path, self.path)
+
+    def to_result(self) -> dict:
+        return {
+            "result_type": "zip",
+            "path": str(self.path),
+            "size": self.path.stat().st_size,
+            "num_of_images": self._writer.count,
+        }
+
+
+def save_result_archive(task_id: str, image_list: list[Image.Image]) -> dict:
+    with ResultArchive(task_id) as archive:
+        archive.add(image_list)
+    return archive.to_result()
+
+
+def is_result_archive(result) -> bool:
+    return isinstance(result, dict) and result.get("result_type") == "zip"
+
+
+def sweep_results():
+    # 결과를 가져가지 않았거나 전송 도중 연결이 끊긴 ZIP (작성 중 중단된 .part 포함)을 주기적으로 정리
+    expired_at = time.time() - settings.RESULT_TTL_SECONDS
+    for path in Path(settings.RESULT_DIR).glob("*.zip*"):
+        try:
+            if path.stat().st_mtime < expired_at:
+                path.unlink()
+        except OSError:
+            continue
+
+
+async def sweep_results_periodically():
+    global _last_sweep
+
+    if time.monotonic() - _last_sweep > SWEEP_INTERVAL:
+        _last_sweep = time.monotonic()
+        await run_in_threadpool(sweep_results)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from celery.result import AsyncResult
+
+from core.config import settings
+from utils.metrics import record_cache_stats
+from utils.pipeline import get_checkpoint_revision
+from utils.placement import apply_async_on_device
+from utils.result import get_result_archive_path
+from utils.task_events import publish_task_event
+
+# 결과에 영향을 주지 않는 인자 (어느 GPU에서 생성했는지, 결과를 어디로 올릴지는 결과와 무관)
+IGNORED_ARGUMENTS = {"gpu_device", "result_upload"}
+BYTES_ARGUMENTS = ["images", "init_image_files", "mask_image_files", "masks"]
+
+
+def _canonicalize(value):
+    # 이미지 원본 대신 내용 해시를 key에 사용
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(value).hexdigest()
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _canonicalize(v) for k, v in value.items()}
+    return value
+
+
+def get_model_revision(task_arguments: dict) -> Optional[int]:
+    # 같은 이름으로 재학습/교체된 체크포인트의 결과를 재사용하지 않도록 key에 체크포인트 버전을 포함
+    # (OUTPUT_DIR에 없는 모델 - lama, RMBG 등 - 은 None)
+    model = task_arguments.get("model")
+    if not model:
+        return None
+    return get_checkpoint_revision(Path(settings.OUTPUT_DIR) / str(model))
+
+
+def make_result_cache_key(task_name: str, task_arguments: dict) -> str:
+    arguments = {k: v for k, v in task_arguments.items() if k not in IGNORED_ARGUMENTS}
+    canonical = json.dumps([task_name, _canonicalize(arguments), get_model_revision(task_arguments)],
+                           sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    # 같은 모델/프롬프트/시드/입력 이미지로 요청하면 같은 이미지가 나오므로 결과 ZIP을 로컬 디스크에 보관하고 재사용
+    # 파일의 수정 시각을 마지막 사용 시각으로 보고 전체 크기가 상한을 넘으면 오래된 것부터 삭제 (LRU)
+
+    def __init__(self, cache_dir: str, max_size_mb: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size_mb * (1024 ** 2)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.zip"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        path = self._path(key)
+        try:
+            # 사용 시각 갱신 (LRU)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return path
+
+    def store(self, key: str, archive_path) -> None:
+        path = self._path(key)
+        if path.exists():
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.part")
+        _link_or_copy(archive_path, temp_path)
+        os.replace(temp_path, path)
+
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.zip"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                path.unlink(missing_ok=True)
+                total_size -= size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+        }
+
+
+def _link_or_copy(src, dst):
+    # 같은 파일 시스템이면 hard link로 복사 없이 공유
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+result_cache = ResultCache(settings.RESULT_CACHE_DIR, settings.RESULT_CACHE_MAX_SIZE_MB)
+
+
+def apply_async_cached(task, form_data: dict, model: Optional[str] = None):
+    # 캐시에 같은 요청의 결과가 있으면 GPU 작업 없이 바로 SUCCESS 상태의 task를 만들어 반환
+    if not result_cache.enabled:
+        return apply_async_on_device(task, form_data, model)
+
+    key = make_result_cache_key(task.name, form_data)
+    cached_path = result_cache.lookup(key)
+    record_cache_stats("result", result_cache.stats())
+
+    if cached_path is None:
+        return apply_async_on_device(task, form_data, model)
+
+    task_id = str(uuid.uuid4())
+    archive_path = get_result_archive_path(task_id)
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    # 결과 조회 API는 전송 후 spool 파일을 지우므로 캐시 원본이 아닌 사본(link)을 넘김
+    try:
+        _link_or_copy(cached_path, archive_path)
+    except FileNotFoundError:
+        # lookup 이후 다른 요청의 eviction으로 삭제된 경우 실제로 생성
+        archive_path.unlink(missing_ok=True)
+        return apply_async_on_device(task, form_data, model)
+
+    result = {
+        "result_type": "zip",
+        "path": str(archive_path),
+        "size": archive_path.stat().st_size,
+        "cached": True,
+    }
+    # result_extended로 저장되는 task 이름/인자 (이미지 원본은 제외)
+    request = SimpleNamespace(
+        task=task.name,
+        args=[],
+        kwargs={k: v for k, v in form_data.items() if k not in BYTES_ARGUMENTS and k != "result_upload"},
+        hostname=None,
+        retries=0,
+        delivery_info=None,
+    )
+    task.backend.store_result(task_id, result, "SUCCESS", request=request)
+    publish_task_event(task_id, "SUCCESS", task.name, result_data_type="image", cached=True)
+    return AsyncResult(task_id, app=task.app)
+
+
+def store_cached_result(task_name: str, task_arguments: dict, result: dict):
+    # 워커가 만든 결과를 캐시에 등록 (캐시에서 꺼낸 결과는 다시 등록하지 않음)
+    if not result_cache.enabled or result.get("cached"):
+        return
+
+    # 생성이 끝난 뒤 체크포인트가 바뀌었다면 새 버전의 key로 등록되지 않도록 제외
+    revision = get_model_revision(task_arguments)
+    if revision is not None and revision > os.stat(result["path"]).st_mtime_ns:
+        return
+
+    result_cache.store(make_result_cache_key(task_name, task_arguments), result["path"])
@@ -0,0 +1,47 @@
+import numpy as np
+import torch
+import torch.nn.functional as F
+from PIL import Image
+from transformers import AutoModelForImageSegmentation
+
+RMBG_INPUT_SIZE = (1024, 1024)
+
+
+class RemoveBackgroundEngine:
+    # briaai/RMBG 모델을 직접 호출해 여러 장을 하나의 텐서 배치로 처리
+    # (transformers pipeline은 리스트를 받아도 이미지를 한 장씩 모델에 넣는다)
+
+    def __init__(self, model: str, device: torch.device):
+        self.device = device
+
+        self.model = AutoModelForImageSegmentation.from_pretrained(model, trust_remote_code=True)
+        self.model.to(device).eval()
+
+    @staticmethod
+    def prepare(image: Image.Image) -> tuple[Image.Image, np.ndarray]:
+        # 디코딩과 리사이즈는 스레드에서 미리 해두고, 정규화는 배치 단위로 한 번에 처리
+        resized = np.asarray(image.resize(RMBG_INPUT_SIZE, Image.BILINEAR))
+        return image, resized
+
+    @torch.inference_mode()
+    def remove_background(self, images: list[Image.Image], resized: list[np.ndarray]) -> list[Image.Image]:
+        # (B, H, W, 3) uint8 -> (B, 3, H, W), RMBG 전처리: /255, mean 0.5, std 1.0
+        batch = torch.from_numpy(np.stack(resized)).to(self.device)
+        batch = batch.permute(0, 3, 1, 2).float().div_(255.0).sub_(0.5)
+
+        masks = self.model(batch)[0][0]
+
+        output_images = []
+        for image, mask in zip(images, masks):
+            mask = F.interpolate(mask.unsqueeze(0), size=(image.height, image.width), mode="bilinear").squeeze()
+
+            # 이미지별로 0~1 범위로 정규화
+            mask_min, mask_max = mask.min(), mask.max()
+            mask = (mask - mask_min) / (mask_max - mask_min).clamp_min(1e-8)
+            mask = (mask * 255).to(torch.uint8).cpu().numpy()
+
+            output_image = image.convert("RGBA")
+            output_image.putalpha(Image.fromarray(mask))
+            output_images.append(output_image)
+
+        return output_images
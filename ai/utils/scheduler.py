@@ -1,48 +1,49 @@
+import json
+from functools import lru_cache
+
+import diffusers
+
+# 스케줄러 이름 -> (diffusers 클래스 이름, from_config에 넘길 추가 인자)
+SCHEDULERS = {
+    "DPM++ 2M": ("DPMSolverMultistepScheduler", {}),
+    "DPM++ 2M Karras": ("DPMSolverMultistepScheduler", {"use_karras_sigmas": True}),
+    "DPM++ 2M SDE": ("DPMSolverMultistepScheduler", {"algorithm_type": "sde-dpmsolver++"}),
+    "DPM++ 2M SDE Karras": ("DPMSolverMultistepScheduler", {"use_karras_sigmas": True, "algorithm_type": "sde-dpmsolver++"}),
+    "DPM++ SDE": ("DPMSolverSinglestepScheduler", {}),
+    "DPM++ SDE Karras": ("DPMSolverSinglestepScheduler", {"use_karras_sigmas": True}),
+    "DPM2": ("KDPM2DiscreteScheduler", {}),
+    "DPM2 Karras": ("KDPM2DiscreteScheduler", {"use_karras_sigmas": True}),
+    "DPM2 a": ("KDPM2AncestralDiscreteScheduler", {}),
+    "DPM2 a Karras": ("KDPM2AncestralDiscreteScheduler", {"use_karras_sigmas": True}),
+    "Euler": ("EulerDiscreteScheduler", {}),
+    "Euler a": ("EulerAncestralDiscreteScheduler", {}),
+    "Heun": ("HeunDiscreteScheduler", {}),
+    "LMS": ("LMSDiscreteScheduler", {}),
+    "LMS Karras": ("LMSDiscreteScheduler", {"use_karras_sigmas": True}),
+}
+
+
+def get_scheduler_names() -> list[str]:
+    return list(SCHEDULERS)
+
+
+def freeze_scheduler_config(pipeline_scheduler_config) -> str:
+    # FrozenDict는 해시할 수 없으므로 정렬된 JSON 문자열로 바꿔 캐시 key로 사용
+    return json.dumps(dict(pipeline_scheduler_config), sort_keys=True, default=str)
+
+
+@lru_cache(maxsize=64)
+def _resolve_scheduler(scheduler_name: str, frozen_config: str):
+    # 클래스 조회와 설정 병합만 캐시 (scheduler 인스턴스는 timesteps / step index 등 실행 상태를 가지므로 공유 불가)
+    class_name, kwargs = SCHEDULERS[scheduler_name]
+    scheduler_cls = getattr(diffusers, class_name)
+    return scheduler_cls, {**json.loads(frozen_config), **kwargs}
+
+
 def get_scheduler(scheduler_name: str, pipeline_scheduler_config):
-    if scheduler_name == "DPM++ 2M":
-        from diffusers import DPMSolverMultistepScheduler
-        return DPMSolverMultistepScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "DPM++ 2M Karras":
-        from diffusers import DPMSolverMultistepScheduler
-        return DPMSolverMultistepScheduler.from_config(pipeline_scheduler_config, use_karras_sigmas=True)
-    elif scheduler_name == "DPM++ 2M SDE":
-        from diffusers import DPMSolverMultistepScheduler
-        return DPMSolverMultistepScheduler.from_config(pipeline_scheduler_config, algorithm_type="sde-dpmsolver++")
-    elif scheduler_name == "DPM++ 2M SDE Karras":
-        from diffusers import DPMSolverMultistepScheduler
-        return DPMSolverMultistepScheduler.from_config(pipeline_scheduler_config, use_karras_sigmas=True, algorithm_type="sde-dpmsolver++")
-    elif scheduler_name == "DPM++ SDE":
-        from diffusers import DPMSolverSinglestepScheduler
-        return DPMSolverSinglestepScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "DPM++ SDE Karras":
-        from diffusers import DPMSolverSinglestepScheduler
-        return DPMSolverSinglestepScheduler.from_config(pipeline_scheduler_config, use_karras_sigmas=True)
-    elif scheduler_name == "DPM2":
-        from diffusers import KDPM2DiscreteScheduler
-        return KDPM2DiscreteScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "DPM2 Karras":
-        from diffusers import KDPM2DiscreteScheduler
-        return KDPM2DiscreteScheduler.from_config(pipeline_scheduler_config, use_karras_sigmas=True)
-    elif scheduler_name == "DPM2 a":
-        from diffusers import KDPM2AncestralDiscreteScheduler
-        return KDPM2AncestralDiscreteScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "DPM2 a Karras":
-        from diffusers import KDPM2AncestralDiscreteScheduler
-        return KDPM2AncestralDiscreteScheduler.from_config(pipeline_scheduler_config, use_karras_sigmas=True)
-    elif scheduler_name == "Euler":
-        from diffusers import EulerDiscreteScheduler
-        return EulerDiscreteScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "Euler a":
-        from diffusers import EulerAncestralDiscreteScheduler
-        return EulerAncestralDiscreteScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "Heun":
-        from diffusers import HeunDiscreteScheduler
-        return HeunDiscreteScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "LMS":
-        from diffusers import LMSDiscreteScheduler
-        return LMSDiscreteScheduler.from_config(pipeline_scheduler_config)
-    elif scheduler_name == "LMS Karras":
-        from diffusers import LMSDiscreteScheduler
-        return LMSDiscreteScheduler.from_config(pipeline_scheduler_config, use_karras_sigmas=True)
-    else:
-        raise ValueError("일치하는 이름의 스케줄러를 찾을 수 없습니다.")
\ No newline at end of file
+    if scheduler_name not in SCHEDULERS:
+        raise ValueError("일치하는 이름의 스케줄러를 찾을 수 없습니다.")
+
+    # 호출마다 새 인스턴스를 만들어 동시에 실행되는 task끼리 상태가 섞이지 않도록 함
+    scheduler_cls, config = _resolve_scheduler(scheduler_name, freeze_scheduler_config(pipeline_scheduler_config))
+    return scheduler_cls.from_config(dict(config))
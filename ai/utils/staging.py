@@ -0,0 +1,84 @@
+import hashlib
+import os
+import string
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+
+COPY_CHUNK_SIZE = 1024 * 1024
+SWEEP_INTERVAL = 600
+
+_last_sweep = 0.0
+
+
+def get_staged_path(ref: str) -> Path:
+    # ref는 업로드 파일 내용의 sha256 (경로 조작을 막기 위해 16진수만 허용)
+    if len(ref) != 64 or any(c not in string.hexdigits for c in ref):
+        raise ValueError(f"잘못된 입력 파일 참조입니다. : {ref}")
+    return Path(settings.STAGING_DIR) / ref[:2] / ref
+
+
+def stage_file(file: BinaryIO) -> str:
+    # 업로드 파일을 메모리에 모으지 않고 chunk 단위로 공유 디스크에 복사하면서 해시를 계산
+    staging_dir = Path(settings.STAGING_DIR)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = staging_dir / f"{uuid.uuid4().hex}.part"
+
+    sha256 = hashlib.sha256()
+    try:
+        with open(temp_path, "wb") as f:
+            while chunk := file.read(COPY_CHUNK_SIZE):
+                sha256.update(chunk)
+                f.write(chunk)
+
+        ref = sha256.hexdigest()
+        path = get_staged_path(ref)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.exists():
+            # 같은 내용이 이미 있으면 재사용하고 만료 시각만 갱신
+            os.utime(path)
+        else:
+            os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return ref
+
+
+def sweep_staging():
+    # 같은 파일을 여러 task가 공유할 수 있으므로 task가 끝날 때 지우지 않고 오래된 파일을 주기적으로 정리
+    expired_at = time.time() - settings.STAGING_TTL_SECONDS
+    for path in Path(settings.STAGING_DIR).glob("*/*"):
+        try:
+            if path.stat().st_mtime < expired_at:
+                path.unlink()
+        except OSError:
+            continue
+
+
+async def stage_uploads(uploads) -> list[str]:
+    global _last_sweep
+
+    refs = []
+    for upload in uploads:
+        refs.append(await run_in_threadpool(stage_file, upload.file))
+        await upload.close()
+
+    if time.monotonic() - _last_sweep > SWEEP_INTERVAL:
+        _last_sweep = time.monotonic()
+        await run_in_threadpool(sweep_staging)
+
+    return refs
+
+
+def load_staged_image(ref: str, mode: str = "RGB") -> Image.Image:
+    with Image.open(get_staged_path(ref)) as image:
+        return image.convert(mode)
+
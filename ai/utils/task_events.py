@@ -0,0 +1,42 @@
+import json
+import time
+from typing import Optional
+
+from celery import current_task
+from redis.exceptions import RedisError
+
+from core.config import settings
+from utils.redis_client import get_redis_client
+
+# backend가 구독하는 채널 / 구독 전에 발생한 마지막 이벤트를 보관하는 key
+TASK_EVENT_CHANNEL = "task_events:{task_id}"
+TASK_EVENT_LAST_KEY = "task_events:last:{task_id}"
+
+
+def publish_task_event(task_id: str, state: str, task_name: Optional[str] = None, **data):
+    # state: STARTED | PROGRESS | SUCCESS | FAILURE | REVOKED
+    event = {
+        "task_id": task_id,
+        "task_name": task_name,
+        "task_status": state,
+        "timestamp": time.time(),
+        **data,
+    }
+    payload = json.dumps(event, default=str)
+
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.set(TASK_EVENT_LAST_KEY.format(task_id=task_id), payload, ex=settings.TASK_EVENT_TTL)
+        pipe.publish(TASK_EVENT_CHANNEL.format(task_id=task_id), payload)
+        pipe.execute()
+    except RedisError as e:
+        print(f"Failed to publish task event: {e}")
+
+
+def publish_task_progress(completed: int, total: int):
+    # 실행 중인 celery task의 진행 상황 (task 밖에서 호출하면 무시)
+    request = getattr(current_task, "request", None)
+    if request is None or request.id is None:
+        return
+
+    publish_task_event(request.id, "PROGRESS", current_task.name, completed=completed, total=total)
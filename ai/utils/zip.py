@@ -1,32 +1,97 @@
 import zipfile
 import io
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Optional
+
 from PIL import Image
 
+from core.config import settings
 
-def generate_zip_from_images(image_list: list[Image.Image]):
-    zip_buffer = io.BytesIO()
+_encoder_pool: Optional[ThreadPoolExecutor] = None
 
-    # ZIP_STORED : 압축 없이 저장
-    # 이미지 파일은 이미 압축된 상태이므로, 빠른 압축 알고리즘을 사용하거나 압축을 아예 하지 않고 ZIP 포맷으로 묶어 보내는 것이 적합
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zipf:
-        for index, image in enumerate(image_list):
-            img_buffer = io.BytesIO()
-            file_name = f"{index + 1}"
 
-            if image.mode == "RGBA":
-                # Remove Background의 산출물과 같이 RGBA로 되어있다면 알파 채널(투명도)을 지원하는 PNG로 변환
-                image.save(img_buffer, format="PNG")
-                file_name += ".png"
-            else:
-                # 투명도가 필요 없는 경우는 용량 대비 품질 효율이 좋은 JPEG로 저장
-                image.save(img_buffer, format="JPEG")
-                file_name += f".jpeg"
+def get_encoder_pool() -> ThreadPoolExecutor:
+    # Pillow는 인코딩 중 GIL을 풀어주므로 스레드로 여러 이미지를 동시에 인코딩할 수 있다
+    # (prefork 워커에서 fork 이후에 만들어지도록 처음 사용할 때 생성)
+    global _encoder_pool
+    if _encoder_pool is None:
+        _encoder_pool = ThreadPoolExecutor(max_workers=settings.IMAGE_ENCODE_WORKERS, thread_name_prefix="image-encoder")
+    return _encoder_pool
 
-            img_buffer.seek(0)
 
-            zipf.writestr(file_name, img_buffer.read())
+def encode_image(image: Image.Image) -> tuple[str, io.BytesIO]:
+    img_buffer = io.BytesIO()
 
-    zip_buffer.seek(0)
-    return zip_buffer
+    if image.mode == "RGBA":
+        # Remove Background의 산출물과 같이 RGBA로 되어있다면 알파 채널(투명도)을 지원하는 PNG로 변환
+        image.save(img_buffer, format="PNG")
+        return "png", img_buffer
+
+    # 투명도가 필요 없는 경우는 용량 대비 품질 효율이 좋은 JPEG로 저장
+    image.save(
+        img_buffer,
+        format="JPEG",
+        quality=settings.JPEG_QUALITY,
+        optimize=settings.JPEG_OPTIMIZE,
+        subsampling=settings.JPEG_SUBSAMPLING,
+    )
+    return "jpeg", img_buffer
+
+
+class ImageZipWriter:
+    # 배치가 끝날 때마다 이미지를 넘겨받아 백그라운드 스레드에서 인코딩하고, 끝난 순서대로 ZIP에 추가
+    # 다음 배치가 GPU에서 생성되는 동안 이전 배치의 인코딩이 진행되어 전체 소요 시간이 GPU 시간에 가까워진다
+
+    def __init__(self, zip_buffer: BinaryIO):
+        self.zip_buffer = zip_buffer
+        self.count = 0
+        self._zipf = zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED)
+        self._pending: deque[Future] = deque()
+
+    def add(self, image_list: list[Image.Image]):
+        pool = get_encoder_pool()
+        for image in image_list:
+            self._pending.append(pool.submit(encode_image, image))
+
+        # 이미 인코딩이 끝난 이미지만 기록하고 바로 반환 (GPU 작업을 막지 않음)
+        self._flush(block=False)
 
+    def _flush(self, block: bool):
+        # 파일 번호가 이미지 순서와 일치하도록 앞에서부터 순서대로 기록
+        while self._pending and (block or self._pending[0].done()):
+            extension, img_buffer = self._pending.popleft().result()
+            self.count += 1
 
+            # getbuffer()로 인코딩된 버퍼를 복사 없이 그대로 기록
+            with img_buffer.getbuffer() as data:
+                self._zipf.writestr(f"{self.count}.{extension}", data)
+
+    def close(self):
+        try:
+            self._flush(block=True)
+        finally:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+            self._zipf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def generate_zip_from_images(image_list: list[Image.Image], zip_buffer: Optional[BinaryIO] = None):
+    # zip_buffer를 넘기면 (예: 디스크의 파일) 메모리에 아카이브 전체를 만들지 않고 바로 기록
+    if zip_buffer is None:
+        zip_buffer = io.BytesIO()
+
+    # ZIP_STORED : 압축 없이 저장
+    # 이미지 파일은 이미 압축된 상태이므로, 빠른 압축 알고리즘을 사용하거나 압축을 아예 하지 않고 ZIP 포맷으로 묶어 보내는 것이 적합
+    with ImageZipWriter(zip_buffer) as writer:
+        writer.add(image_list)
+
+    zip_buffer.seek(0)
+    return zip_buffer
@@ -1,3 +1,4 @@
+import torch
 from celery import Celery
 from core.config import settings
 
@@ -11,6 +12,8 @@ celery_app.autodiscover_tasks([
     'workers.tasks.generation',
     'workers.tasks.model',
     'workers.tasks.training',
+    'workers.preload',
+    'workers.events',
 ], force=True)
 
 # 큐 설정
@@ -25,6 +28,14 @@ celery_app.conf.task_queues = {
     },
 }
 
+# GPU별 생성 큐 (워커는 -Q gen_queue_<n>으로 하나의 GPU에 고정)
+for device in range(torch.cuda.device_count()):
+    queue_name = f"{settings.GEN_QUEUE_PREFIX}_{device}"
+    celery_app.conf.task_queues[queue_name] = {
+        'exchange': queue_name,
+        'routing_key': queue_name,
+    }
+
 celery_app.conf.update(
     task_serializer='pickle',           # 작업 직렬화 방법
     result_serializer='pickle',         # 결과 직렬화 방법
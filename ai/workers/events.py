@@ -0,0 +1,28 @@
+from celery.signals import task_prerun, task_success, task_failure, task_revoked
+
+from utils.result import is_result_archive
+from utils.task_events import publish_task_event
+
+
+# 클라이언트가 결과를 polling하지 않도록 task 상태가 바뀔 때마다 Redis pub/sub으로 알림
+# (결과 데이터는 보내지 않고, 완료 알림을 받은 클라이언트가 결과 조회 API를 한 번 호출)
+
+@task_prerun.connect
+def publish_task_started(task_id=None, task=None, **kwargs):
+    publish_task_event(task_id, "STARTED", task.name)
+
+
+@task_success.connect
+def publish_task_success(sender=None, result=None, **kwargs):
+    result_data_type = "image" if is_result_archive(result) else type(result).__name__
+    publish_task_event(sender.request.id, "SUCCESS", sender.name, result_data_type=result_data_type)
+
+
+@task_failure.connect
+def publish_task_failure(sender=None, task_id=None, exception=None, **kwargs):
+    publish_task_event(task_id, "FAILURE", sender.name, message=str(exception))
+
+
+@task_revoked.connect
+def publish_task_revoked(sender=None, request=None, **kwargs):
+    publish_task_event(request.id, "REVOKED", sender.name)
@@ -0,0 +1,108 @@
+import threading
+from pathlib import Path
+
+import torch
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from diffusers import StableDiffusionPipeline
+
+from core.config import settings
+from utils.model_cache import model_cache, get_clip_interrogator, get_rmbg_engine
+from utils.pipeline import pipeline_cache
+from utils.placement import publish_resident_models
+from utils.readiness import set_worker_readiness, clear_worker_readiness
+
+
+def preload_models():
+    # 자주 쓰는 기본 모델을 워커가 뜰 때 미리 올려, 배포/스케일 아웃 직후 첫 요청이 모델 로드를 기다리지 않게 함
+    device = torch.device("cuda", settings.WORKER_GPU_DEVICE)
+    torch.cuda.set_device(device)
+    set_worker_readiness(device, "warming")
+
+    try:
+        for base_model in settings.BASE_MODEL_NAME.split("|"):
+            model_path = Path(settings.OUTPUT_DIR) / base_model
+            pipeline_cache.get(StableDiffusionPipeline, model_path, torch_dtype=torch.float16, device=device)
+
+        if settings.PRELOAD_CLIP_MODEL:
+            get_clip_interrogator(settings.PRELOAD_CLIP_MODEL, device)
+        if settings.PRELOAD_RMBG_MODEL:
+            get_rmbg_engine(settings.PRELOAD_RMBG_MODEL, device)
+    except Exception as e:
+        set_worker_readiness(device, "failed", error=str(e))
+        return
+
+    models = pipeline_cache.resident_models(device) + model_cache.resident_models(device)
+    publish_resident_models(device, models)
+    set_worker_readiness(device, "ready", models)
+
+
+def start_preload():
+    # 워커 프로세스 초기화가 오래 걸리면 celery가 프로세스를 다시 띄우므로 백그라운드에서 로드
+    # (로드 중에 들어온 같은 모델의 요청은 캐시에서 로드가 끝나기를 기다렸다가 올라간 모델을 그대로 사용)
+    threading.Thread(target=preload_models, name="model-preload", daemon=True).start()
+
+
+def should_preload() -> bool:
+    # GPU에 고정된 생성 워커만 미리 로드 (학습 워커 등은 WORKER_GPU_DEVICE를 지정하지 않음)
+    return settings.PRELOAD_ENABLED and settings.WORKER_GPU_DEVICE is not None and torch.cuda.is_available()
+
+
+def apply_torch_threads():
+    # 프로세스 전체에 적용되는 설정이므로 엔진 생성 시점이 아니라 워커 시작 시 한 번만 적용
+    if settings.TORCH_NUM_THREADS > 0:
+        torch.set_num_threads(settings.TORCH_NUM_THREADS)
+
+
+@worker_init.connect
+def apply_torch_threads_on_worker_init(**kwargs):
+    apply_torch_threads()
+
+
+@worker_process_init.connect
+def apply_torch_threads_on_worker_process_init(**kwargs):
+    # prefork pool은 fork 이후 자식 프로세스에서도 같은 값이 적용되도록 다시 설정
+    apply_torch_threads()
+
+
+# prefork pool에서 자식 프로세스가 여러 개면 모두 같은 GPU에 모델을 올리게 되므로, 자식이 하나일 때만 미리 로드
+# (worker_init은 fork 전 부모 프로세스에서 실행되므로 이 값은 자식 프로세스에 그대로 전달된다)
+_preload_in_child = False
+
+
+@worker_init.connect
+def preload_on_worker_init(sender=None, **kwargs):
+    global _preload_in_child
+
+    if not should_preload():
+        return
+
+    pool_module = getattr(sender.pool_cls, "__module__", str(sender.pool_cls))
+    if "prefork" not in pool_module:
+        # solo / threads pool은 워커 프로세스 하나가 모든 작업을 실행하므로 한 번만 로드
+        start_preload()
+    elif sender.concurrency == 1:
+        _preload_in_child = True
+    else:
+        print(f"Skipping model preload: prefork pool with concurrency {sender.concurrency} "
+              f"would load every model once per child process (use --pool=threads or --concurrency=1)")
+
+
+@worker_process_init.connect
+def preload_on_worker_process_init(**kwargs):
+    # prefork pool: fork 이후 자식 프로세스에서 CUDA를 초기화해야 한다
+    if _preload_in_child:
+        start_preload()
+
+
+@worker_process_shutdown.connect
+def clear_readiness_on_process_shutdown(**kwargs):
+    if _preload_in_child:
+        clear_worker_readiness()
+
+
+@worker_shutdown.connect
+def clear_readiness_on_shutdown(**kwargs):
+    # solo / threads pool은 worker_process_shutdown이 발생하지 않음
+    # (종료 신호 없이 죽은 워커는 heartbeat가 멈춰 READINESS_TTL 뒤에 사라짐)
+    if should_preload():
+        clear_worker_readiness()
@@ -1,447 +1,378 @@
-import gc
-import os
-import subprocess
-from io import BytesIO
+from functools import lru_cache, partial
 from pathlib import Path
-from tempfile import TemporaryDirectory
 
-import PIL.Image
 import torch
 import torch.cuda
 from PIL import Image
-from clip_interrogator import Interrogator, Config
 from diffusers import StableDiffusionPipeline, StableDiffusionImg2ImgPipeline, AutoPipelineForInpainting
 from fastapi import HTTPException, status
-from transformers import pipeline
 
 from core.config import settings
 from workers.celery import celery_app
+from utils.batching import DynamicBatcher
+from utils.metrics import record_task_metrics, record_cache_stats
+from utils.model_cache import model_cache, get_clip_interrogator, get_inpaint_engine, get_rmbg_engine
+from utils.object_storage import upload_result_archive
+from utils.pipeline import pipeline_cache, resolve_device
+from utils.placement import publish_resident_models
+from utils.prompt_cache import prompt_cache
+from utils.profiling import TaskProfiler, instrument_pipeline, profile_phase, release_cuda_memory
 from utils.scheduler import get_scheduler
-from utils.zip import generate_zip_from_images
-
-
-@celery_app.task(name="text_to_image", queue="gen_queue")
-def text_to_image_task(
-        model, gpu_device, scheduler, prompt, negative_prompt, width, height,
-        num_inference_steps, guidance_scale, seed, batch_count, batch_size
-):
-    torch.cuda.set_device(gpu_device)
-
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model_dir = settings.OUTPUT_DIR
-    model_path = Path(model_dir) / model
-
-    t2i_pipe = StableDiffusionPipeline.from_pretrained(model_path, torch_dtype=torch.float16).to(device)
+from utils.result import ResultArchive
+from utils.staging import load_staged_image
+from utils.task_events import publish_task_progress
+from utils.zip import get_encoder_pool
+
+
+def finish_task(profiler: TaskProfiler, device, result_archive=None, result_upload=None):
+    # 측정 결과를 /metrics로 내보내고, 정책에 따라서만 캐시된 GPU 메모리를 해제
+    # (프로파일링이 꺼져 있으면 metrics가 없으므로 Redis에 기록하지 않음)
+    metrics = profiler.to_dict()
+    if metrics:
+        record_task_metrics(metrics)
+        record_cache_stats("pipeline", pipeline_cache.stats())
+        record_cache_stats("model", model_cache.stats())
+        record_cache_stats("prompt_embeds", prompt_cache.stats())
+    publish_resident_models(device, pipeline_cache.resident_models(device) + model_cache.resident_models(device))
+    release_cuda_memory(device)
+
+    if result_archive is not None and metrics:
+        result_archive["metrics"] = metrics
+    if result_archive is not None and result_upload:
+        result_archive = upload_result_archive(result_archive, result_upload)
+    return result_archive
+
+
+def encode_prompts(pipe, model_path, prompts: list[str], negative_prompts: list[str]):
+    # 텍스트 인코더 출력을 캐시에서 가져와 prompt_embeds / negative_prompt_embeds로 전달
+    # negative prompt가 없으면 빈 문자열(기본 unconditional 입력)의 임베딩을 사용
+    # (텍스트 인코더 실행 시간은 hook이 encode_prompt로 따로 기록)
+    with profile_phase("prompt_embeds"):
+        prompt_embeds = prompt_cache.encode(pipe, model_path, prompts)
+        negative_prompt_embeds = prompt_cache.encode(pipe, model_path, [p or "" for p in negative_prompts])
+    return prompt_embeds, negative_prompt_embeds
+
+
+def iter_sample_batches(seeds: list[int], images_per_source: int, device, source_size=None):
+    # 출력 이미지 n은 원본 n // images_per_source와 seeds[n]으로 생성 (기존 출력 순서와 동일)
+    # 원본이 달라도 IMAGE_BATCH_MAX_SIZE까지 한 번의 파이프라인 호출에 함께 넣고,
+    # 이미지마다 generator를 따로 둬서 시드별 결과를 재현
+    # source_size가 주어지면 크기가 다른 원본은 같은 호출에 넣지 않음 (파이프라인이 첫 원본 크기로 맞춰버리므로)
+    chunk_size = max(1, settings.IMAGE_BATCH_MAX_SIZE)
+
+    start = 0
+    while start < len(seeds):
+        end = min(start + chunk_size, len(seeds))
+        if source_size is not None:
+            size = source_size(start // images_per_source)
+            for n in range(start + images_per_source - start % images_per_source, end, images_per_source):
+                if source_size(n // images_per_source) != size:
+                    end = n
+                    break
+
+        sources = [n // images_per_source for n in range(start, end)]
+        generators = [torch.Generator(device=device).manual_seed(s) for s in seeds[start:end]]
+        yield sources, generators
+        start = end
+
+
+def run_text_to_image_batch(key, items):
+    # items: (prompt, negative_prompt, seed) 목록, 요청마다 프롬프트가 달라도 한 번의 호출로 생성
+    model, device, scheduler, width, height, num_inference_steps, guidance_scale = key
+
+    if device.type == "cuda":
+        torch.cuda.set_device(device)
+
+    model_path = Path(settings.OUTPUT_DIR) / model
+    with profile_phase("load"):
+        t2i_pipe = pipeline_cache.get(StableDiffusionPipeline, model_path, torch_dtype=torch.float16, device=device)
+    instrument_pipeline(t2i_pipe)
 
     if scheduler:
         t2i_pipe.scheduler = get_scheduler(scheduler, t2i_pipe.scheduler.config)
 
-    print("After loading model:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-    total_images = batch_size * batch_count
-    seeds = [(seed + i) % (2 ** 32) for i in range(total_images)]
-
-    generated_image_list = []
+    generators = [torch.Generator(device=device).manual_seed(seed) for _, _, seed in items]
 
-    for i in range(batch_count):
-        current_seeds = seeds[i * batch_size: (i + 1) * batch_size]
-        generators = [torch.Generator(device=device).manual_seed(s) for s in current_seeds]
+    prompt_embeds, negative_prompt_embeds = encode_prompts(
+        t2i_pipe, model_path,
+        [prompt for prompt, _, _ in items],
+        [negative_prompt for _, negative_prompt, _ in items],
+    )
 
+    with profile_phase("generate"):
         images = t2i_pipe(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
+            prompt_embeds=prompt_embeds,
+            negative_prompt_embeds=negative_prompt_embeds,
             width=width,
             height=height,
             num_inference_steps=num_inference_steps,
             guidance_scale=guidance_scale,
             generator=generators,
-            num_images_per_prompt=len(generators),
+            num_images_per_prompt=1,
         ).images
 
-        generated_image_list.extend(images)
-
-        print("After processing batch:")
-        print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-        print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-        print("-----------")
-
-    zip_buffer = generate_zip_from_images(generated_image_list)
+    return images
 
-    del t2i_pipe
-    print("After deleting pipe:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
 
-    gc.collect()
-    print("After garbage collection:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+text_to_image_batcher = DynamicBatcher(
+    run_text_to_image_batch,
+    max_batch_size=settings.TTI_MAX_BATCH_SIZE,
+    max_wait_ms=settings.TTI_MAX_BATCH_WAIT_MS,
+)
 
-    torch.cuda.empty_cache()
-    print("After empty_cache:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
 
-    torch.cuda.ipc_collect()
-    print("After ipc_collect:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+@celery_app.task(name="text_to_image", queue="gen_queue", bind=True)
+def text_to_image_task(
+        self, model, gpu_device, scheduler, prompt, negative_prompt, width, height,
+        num_inference_steps, guidance_scale, seed, batch_count, batch_size, result_upload=None
+):
+    torch.cuda.set_device(gpu_device)
 
-    return zip_buffer
+    device = resolve_device("cuda" if torch.cuda.is_available() else "cpu")
 
+    total_images = batch_size * batch_count
+    seeds = [(seed + i) % (2 ** 32) for i in range(total_images)]
 
-@celery_app.task(name="image_to_image", queue="gen_queue")
+    # 같은 모델/크기/스텝/스케줄러의 요청끼리만 묶일 수 있음
+    batch_key = (model, device, scheduler, width, height, num_inference_steps, guidance_scale)
+    items = [(prompt, negative_prompt, s) for s in seeds]
+
+    with TaskProfiler("text_to_image", device) as profiler:
+        # 배치가 끝날 때마다 결과 ZIP에 넘겨, 다음 배치를 생성하는 동안 인코딩이 진행되도록 함
+        with ResultArchive(self.request.id, total_images) as archive:
+            if settings.TTI_BATCHING_ENABLED:
+                # 배치 단위로 넣어 다른 요청과 번갈아 묶이게 하고, 다음 배치를 미리 넣어둔 채 이전 배치를 결과 ZIP에 넘김
+                # (배치 스레드에는 profiler가 없으므로 대기 시간을 포함해 generate로 기록)
+                chunks = [items[i * batch_size: (i + 1) * batch_size] for i in range(batch_count)]
+                pending = text_to_image_batcher.submit_async(batch_key, chunks[0])
+                for i in range(batch_count):
+                    current = pending
+                    if i + 1 < batch_count:
+                        pending = text_to_image_batcher.submit_async(batch_key, chunks[i + 1])
+
+                    with profiler.phase("generate"):
+                        images = current.result()
+                    archive.add(images)
+            else:
+                for i in range(batch_count):
+                    images = run_text_to_image_batch(batch_key, items[i * batch_size: (i + 1) * batch_size])
+                    archive.add(images)
+
+    return finish_task(profiler, device, archive.to_result(), result_upload)
+
+
+@celery_app.task(name="image_to_image", queue="gen_queue", bind=True)
 def image_to_image_task(
-        model, gpu_device, scheduler, prompt, negative_prompt, width, height,
+        self, model, gpu_device, scheduler, prompt, negative_prompt, width, height,
         num_inference_steps, guidance_scale, strength, seed,
-        batch_count, batch_size, images
+        batch_count, batch_size, images, result_upload=None
 ):
     torch.cuda.set_device(gpu_device)
 
-    image_list = [PIL.Image.open(BytesIO(image_bytes)).convert("RGB") for image_bytes in images]
+    # 원본은 필요한 배치에서만 디코딩 (출력 순서대로 원본을 쓰므로 최근 것만 보관)
+    @lru_cache(maxsize=settings.IMAGE_BATCH_MAX_SIZE)
+    def load_source(index):
+        image = load_staged_image(images[index])
+        if settings.IMAGE_BATCH_RESIZE_SOURCES:
+            # 요청한 크기로 맞춰 크기가 다른 원본도 한 번의 호출에 쌓음 (출력 크기가 원본 크기가 아니라 width/height가 됨)
+            image = image.resize((width, height), Image.LANCZOS)
+        return image
+
+    def source_size(index):
+        return load_source(index).size
 
-    total_images = batch_size * batch_count * len(image_list)
+    total_images = batch_size * batch_count * len(images)
     seeds = [(seed + i) % (2 ** 32) for i in range(total_images)]
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    device = resolve_device("cuda" if torch.cuda.is_available() else "cpu")
 
     model_dir = settings.OUTPUT_DIR
     model_path = Path(model_dir) / model
 
-    i2i_pipe = StableDiffusionImg2ImgPipeline.from_pretrained(model_path, torch_dtype=torch.float16).to(device)
-    if scheduler:
-        i2i_pipe.scheduler = get_scheduler(scheduler, i2i_pipe.scheduler.config)
-
-    print("After loading model:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    generated_image_list = []
-
-    for i in range(len(image_list)):
-        curr_image_index = i * batch_count * batch_size
-        for j in range(batch_count):
-            current_seeds = seeds[curr_image_index + j * batch_size: curr_image_index + (j + 1) * batch_size]
-            generators = [torch.Generator(device=device).manual_seed(s) for s in current_seeds]
-
-            images = i2i_pipe(
-                image=image_list[i],
-                prompt=prompt,
-                negative_prompt=negative_prompt,
-                width=width,
-                height=height,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                strength=strength,
-                generators=generators,
-                num_images_per_prompt=len(generators),
-            ).images
-
-            generated_image_list.extend(images)
-
-    zip_buffer = generate_zip_from_images(generated_image_list)
-
-    del i2i_pipe
-    print("After deleting pipe:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    gc.collect()
-    print("After garbage collection:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    torch.cuda.empty_cache()
-    print("After empty_cache:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    torch.cuda.ipc_collect()
-    print("After ipc_collect:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    return zip_buffer
-
-
-@celery_app.task(name="inpainting", queue="gen_queue")
+    with TaskProfiler("image_to_image", device) as profiler:
+        with profiler.phase("load"):
+            i2i_pipe = pipeline_cache.get(StableDiffusionImg2ImgPipeline, model_path, torch_dtype=torch.float16, device=device)
+        instrument_pipeline(i2i_pipe)
+
+        if scheduler:
+            i2i_pipe.scheduler = get_scheduler(scheduler, i2i_pipe.scheduler.config)
+
+        prompt_embeds, negative_prompt_embeds = encode_prompts(i2i_pipe, model_path, [prompt], [negative_prompt])
+
+        with ResultArchive(self.request.id, total_images) as archive:
+            for sources, generators in iter_sample_batches(seeds, batch_count * batch_size, device, source_size):
+                n = len(generators)
+
+                with profiler.phase("generate"):
+                    images = i2i_pipe(
+                        image=[load_source(i) for i in sources],
+                        prompt_embeds=prompt_embeds.expand(n, -1, -1),
+                        negative_prompt_embeds=negative_prompt_embeds.expand(n, -1, -1),
+                        num_inference_steps=num_inference_steps,
+                        guidance_scale=guidance_scale,
+                        strength=strength,
+                        generator=generators,
+                        num_images_per_prompt=1,
+                    ).images
+
+                archive.add(images)
+
+    return finish_task(profiler, device, archive.to_result(), result_upload)
+
+
+@celery_app.task(name="inpainting", queue="gen_queue", bind=True)
 def inpainting_task(
-        model, gpu_device, scheduler, prompt, negative_prompt, width, height,
+        self, model, gpu_device, scheduler, prompt, negative_prompt, width, height,
         num_inference_steps, guidance_scale, strength, seed,
-        batch_count, batch_size, init_image_files, mask_image_files
+        batch_count, batch_size, init_image_files, mask_image_files, result_upload=None
 ):
     torch.cuda.set_device(gpu_device)
 
-    init_image_list = [PIL.Image.open(BytesIO(image_bytes)).convert("RGB") for image_bytes in init_image_files]
-    mask_image_list = [PIL.Image.open(BytesIO(image_bytes)).convert("RGB") for image_bytes in mask_image_files]
+    # 원본/마스크는 필요한 배치에서만 디코딩 (출력 순서대로 원본을 쓰므로 최근 것만 보관)
+    @lru_cache(maxsize=settings.IMAGE_BATCH_MAX_SIZE)
+    def load_source(index):
+        return load_staged_image(init_image_files[index]), load_staged_image(mask_image_files[index])
 
-    total_images = batch_size * batch_count * len(init_image_list)
+    total_images = batch_size * batch_count * len(init_image_files)
     seeds = [(seed + i) % (2 ** 32) for i in range(total_images)]
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    device = resolve_device("cuda" if torch.cuda.is_available() else "cpu")
 
     model_dir = settings.OUTPUT_DIR
     model_path = Path(model_dir) / model
 
-    inpaint_pipe = AutoPipelineForInpainting.from_pretrained(model_path, torch_dtype=torch.float16).to(device)
-    if scheduler:
-        inpaint_pipe.scheduler = get_scheduler(scheduler, inpaint_pipe.scheduler.config)
-
-    print("After loading model:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    generated_image_list = []
-
-    for i in range(len(init_image_list)):
-        curr_image_index = i * batch_count * batch_size
-        for j in range(batch_count):
-            current_seeds = seeds[curr_image_index + j * batch_size: curr_image_index + (j + 1) * batch_size]
-            generators = [torch.Generator(device=device).manual_seed(s) for s in current_seeds]
-
-            images = inpaint_pipe(
-                image=init_image_list[i],
-                mask_image=mask_image_list[i],
-                prompt=prompt,
-                negative_prompt=negative_prompt,
-                width=width,
-                height=height,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                strength=strength,
-                generators=generators,
-                num_images_per_prompt=len(generators),
-            ).images
-
-            generated_image_list.extend(images)
-
-    zip_buffer = generate_zip_from_images(generated_image_list)
-
-    del inpaint_pipe
-    print("After deleting pipe:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    gc.collect()
-    print("After garbage collection:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    torch.cuda.empty_cache()
-    print("After empty_cache:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    torch.cuda.ipc_collect()
-    print("After ipc_collect:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    return zip_buffer
-
-
-@celery_app.task(name="clean_up", queue="gen_queue")
-def cleanup_task(gpu_device, images, masks, model):
-    torch.cuda.set_device(gpu_device)
+    with TaskProfiler("inpainting", device) as profiler:
+        with profiler.phase("load"):
+            inpaint_pipe = pipeline_cache.get(AutoPipelineForInpainting, model_path, torch_dtype=torch.float16, device=device)
+        instrument_pipeline(inpaint_pipe)
 
-    print("Before RUN:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    if len(images) != len(masks):
-        raise HTTPException(status_code=400, detail="이미지 수와 마스크 수가 일치하지 않습니다.")
+        if scheduler:
+            inpaint_pipe.scheduler = get_scheduler(scheduler, inpaint_pipe.scheduler.config)
 
-    with TemporaryDirectory() as temp_output_dir, \
-            TemporaryDirectory() as temp_image_dir, \
-            TemporaryDirectory() as temp_mask_dir:
+        prompt_embeds, negative_prompt_embeds = encode_prompts(inpaint_pipe, model_path, [prompt], [negative_prompt])
 
-        image_paths = []
-        mask_paths = []
+        with ResultArchive(self.request.id, total_images) as archive:
+            # width/height를 넘기므로 원본 크기가 달라도 파이프라인이 같은 크기로 맞춤
+            for sources, generators in iter_sample_batches(seeds, batch_count * batch_size, device):
+                n = len(generators)
 
-        for index, (image_bytes, mask_bytes) in enumerate(zip(images, masks)):
-            filename = f"image_{index}.png"
+                with profiler.phase("generate"):
+                    images = inpaint_pipe(
+                        image=[load_source(i)[0] for i in sources],
+                        mask_image=[load_source(i)[1] for i in sources],
+                        prompt_embeds=prompt_embeds.expand(n, -1, -1),
+                        negative_prompt_embeds=negative_prompt_embeds.expand(n, -1, -1),
+                        width=width,
+                        height=height,
+                        num_inference_steps=num_inference_steps,
+                        guidance_scale=guidance_scale,
+                        strength=strength,
+                        generator=generators,
+                        num_images_per_prompt=1,
+                    ).images
 
-            temp_image_path = os.path.join(temp_image_dir, filename)
-            temp_mask_path = os.path.join(temp_mask_dir, filename)
+                archive.add(images)
 
-            input_image = Image.open(BytesIO(image_bytes)).convert("RGBA")
-            input_mask = Image.open(BytesIO(mask_bytes)).convert("RGBA")
+    return finish_task(profiler, device, archive.to_result(), result_upload)
 
-            input_image.save(temp_image_path)
-            input_mask.save(temp_mask_path)
 
-            image_paths.append(temp_image_path)
-            mask_paths.append(temp_mask_path)
+@celery_app.task(name="clean_up", queue="gen_queue", bind=True)
+def cleanup_task(self, gpu_device, images, masks, model, result_upload=None):
+    torch.cuda.set_device(gpu_device)
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
+    if len(images) != len(masks):
+        raise HTTPException(status_code=400, detail="이미지 수와 마스크 수가 일치하지 않습니다.")
 
-        cmd = [
-            "iopaint", "run",
-            "--model=lama",
-            # f"--device={device}",
-            f"--device=cpu",
-            f"--image={temp_image_dir}",
-            f"--mask={temp_mask_dir}",
-            f"--output={temp_output_dir}"
-        ]
+    device = resolve_device(settings.CLEANUP_DEVICE)
 
-        result = subprocess.run(cmd, check=True)
+    with TaskProfiler("clean_up", device) as profiler:
+        with profiler.phase("load"):
+            inpaint_engine = get_inpaint_engine(model, device)
 
-        print("After RUN:")
-        print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-        print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-        print("-----------")
+        # 한 번에 처리하는 이미지 수만큼만 디코딩
+        chunk_size = max(1, settings.CLEANUP_WORKERS)
+        pool = get_encoder_pool()
 
-        if result.returncode == 0:
-            output_images = []
+        with ResultArchive(self.request.id, len(images)) as archive:
+            for i in range(0, len(images), chunk_size):
+                with profiler.phase("decode"):
+                    input_images = list(pool.map(partial(load_staged_image, mode="RGBA"), images[i:i + chunk_size]))
+                    input_masks = list(pool.map(load_staged_image, masks[i:i + chunk_size]))
 
-            for filename in os.listdir(temp_output_dir):
-                output_image_path = os.path.join(temp_output_dir, filename)
-                output_image = Image.open(output_image_path)
-                output_images.append(output_image)
+                with profiler.phase("generate"):
+                    output_images = inpaint_engine.inpaint_batch(input_images, input_masks)
 
-            zip_buffer = generate_zip_from_images(output_images)
+                archive.add(output_images)
 
-            return zip_buffer
-        else:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=f"cleanup 중 오류가 발생했습니다. : {result.returncode}")
+    return finish_task(profiler, device, archive.to_result(), result_upload)
 
 
-@celery_app.task(name="remove_background", queue="gen_queue")
-def remove_bg_task(gpu_device, model, batch_size, images):
+@celery_app.task(name="remove_background", queue="gen_queue", bind=True)
+def remove_bg_task(self, gpu_device, model, batch_size, images, result_upload=None):
     torch.cuda.set_device(gpu_device)
 
     if not images:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미지를 첨부해주세요.")
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    device = resolve_device("cuda" if torch.cuda.is_available() else "cpu")
+
+    with TaskProfiler("remove_background", device) as profiler:
+        with profiler.phase("load"):
+            rmbg_engine = get_rmbg_engine(model, device)
 
-    rmbg_pipeline = pipeline("image-segmentation",
-                             model=model,
-                             trust_remote_code=True,
-                             device=device)
+        batch_size = max(1, min(batch_size, settings.RMBG_MAX_BATCH_SIZE))
+        chunks = [images[i:i + batch_size] for i in range(0, len(images), batch_size)]
 
-    print("After loading model:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+        pool = get_encoder_pool()
 
-    generated_image_list = []
+        def prepare(ref):
+            return rmbg_engine.prepare(load_staged_image(ref))
 
-    for i in range(0, len(images), batch_size):
-        batch_images = images[i:i + batch_size]
-        input_images = [Image.open(BytesIO(image_bytes)).convert("RGBA") for image_bytes in batch_images]
-        output_images = rmbg_pipeline(input_images)
-        generated_image_list.extend(output_images)
+        def prepare_chunk(chunk):
+            return [pool.submit(prepare, ref) for ref in chunk]
 
-    zip_buffer = generate_zip_from_images(generated_image_list)
+        # 현재 배치가 모델을 통과하는 동안 다음 배치의 디코딩/리사이즈를 미리 진행
+        next_chunk = prepare_chunk(chunks[0])
 
-    del rmbg_pipeline
-    print("After deleting pipe:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+        with ResultArchive(self.request.id, len(images)) as archive:
+            for i in range(len(chunks)):
+                with profiler.phase("decode"):
+                    input_images, resized = zip(*[future.result() for future in next_chunk])
 
-    gc.collect()
-    print("After garbage collection:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+                if i + 1 < len(chunks):
+                    next_chunk = prepare_chunk(chunks[i + 1])
 
-    torch.cuda.empty_cache()
-    print("After empty_cache:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+                with profiler.phase("generate"):
+                    output_images = rmbg_engine.remove_background(list(input_images), list(resized))
 
-    torch.cuda.ipc_collect()
-    print("After ipc_collect:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+                archive.add(output_images)
 
-    return zip_buffer
+    return finish_task(profiler, device, archive.to_result(), result_upload)
 
 
 @celery_app.task(name="clip", queue="gen_queue")
 def clip_task(model, gpu_device, batch_size, images, mode, caption):
     torch.cuda.set_device(gpu_device)
 
-    clip_config = Config(
-        clip_model_name=model,
-        cache_path="./cache",
-        chunk_size=batch_size,
-    )
+    device = resolve_device("cuda" if torch.cuda.is_available() else "cpu")
+
+    with TaskProfiler("clip", device) as profiler:
+        with profiler.phase("load"):
+            clip_interrogator = get_clip_interrogator(model, device)
+
+        # 요청의 batch_size는 예전 chunk 크기(기본 1024)이므로 한 번의 forward에 넣을 이미지 수는 상한을 둠
+        chunk_size = max(1, min(batch_size, settings.CLIP_MAX_BATCH_SIZE))
+
+        prompts = []
+        for i in range(0, len(images), chunk_size):
+            with profiler.phase("decode"):
+                input_images = list(get_encoder_pool().map(load_staged_image, images[i:i + chunk_size]))
+
+            with profiler.phase("generate"):
+                prompts.extend(clip_interrogator.interrogate_batch(input_images, mode=mode, caption=caption))
+
+            publish_task_progress(len(prompts), len(images))
 
-    clip_config.apply_low_vram_defaults()
-    clip_interrogator = Interrogator(clip_config)
-
-    if torch.cuda.is_available():
-        clip_interrogator.clip_model = clip_interrogator.clip_model.half()
-        clip_interrogator.caption_model = clip_interrogator.caption_model.half()
-    else:
-        raise HTTPException(status_code=400, detail="CLIP API ERROR: GPU is not available.")
-
-    print("After loading model:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    prompts = []
-    for image_bytes in images:
-        input_image = Image.open(BytesIO(image_bytes)).convert("RGB")
-
-        if mode == "classic":
-            prompt = clip_interrogator.interrogate_classic(input_image, caption=caption)
-        elif mode == "fast":
-            prompt = clip_interrogator.interrogate_fast(input_image, caption=caption)
-        elif mode == "negative":
-            prompt = clip_interrogator.interrogate_negative(input_image)
-        else:
-            prompt = clip_interrogator.interrogate(input_image, caption=caption)
-
-        prompts.append(prompt)
-
-    del clip_interrogator
-    print("After deleting interrogator:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    gc.collect()
-    print("After garbage collection:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    torch.cuda.empty_cache()
-    print("After empty_cache:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
-
-    torch.cuda.ipc_collect()
-    print("After ipc_collect:")
-    print(f"Allocated Memory: {torch.cuda.memory_allocated() / (1024 ** 2):.2f} MB")
-    print(f"Reserved Memory: {torch.cuda.memory_reserved() / (1024 ** 2):.2f} MB")
-    print("-----------")
+    finish_task(profiler, device)
 
     return prompts
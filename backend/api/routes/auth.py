@@ -8,7 +8,7 @@ from fastapi import APIRouter
 from fastapi import HTTPException, Response, status, Request
 from fastapi.params import Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from crud import members as members_crud
@@ -25,8 +25,8 @@ router = APIRouter(
 
 @router.post("/login")
 async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-                session: Session = Depends(get_db)):
-    member = authentication_member(form_data.username, form_data.password, session)
+                session: AsyncSession = Depends(get_db)):
+    member = await authentication_member(form_data.username, form_data.password, session)
     if not member:
         raise HTTPException(status_code=401, detail="아이디나 비밀번호가 일치하지 않습니다.")
 
@@ -72,8 +72,8 @@ async def reissue(request: Request, redis: Redis = Depends(get_redis)):
     return response
 
 
-def authentication_member(login_id: str, password: str, session: Session = Depends(get_db)):
-    member = members_crud.get_member_by_login_id(session, login_id)
+async def authentication_member(login_id: str, password: str, session: AsyncSession):
+    member = await members_crud.get_member_by_login_id(session, login_id)
     if not member:
         raise HTTPException(status_code=404, detail="해당 유저를 찾을 수 없습니다.")
     if not verify_password(password, member.password):
@@ -1,12 +1,14 @@
 from typing import Optional, List
 
-import requests
+from aioredis import Redis
 from fastapi import APIRouter, Form, UploadFile, File, HTTPException, status, Depends
 
-from core.config import settings
-from dependencies import get_current_user
+from dependencies import get_current_user, get_ai_client, get_app_redis
 from enums import GPUEnvironment, Role
-from models import Member
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
+from utils.s3 import create_result_upload
+from utils.task_events import register_task_owner
 
 router = APIRouter(
     prefix="/cleanup",
@@ -18,10 +20,12 @@ CLEAN_UP_URL = "/generation/cleanup"
 @router.post("/{gpu_env}")
 async def cleanup(
         gpu_env: GPUEnvironment,
-        gpu_device: int = Form(..., description="사용할 GPU의 장치 번호"),
+        gpu_device: str = Form("auto", description="사용할 GPU의 장치 번호 (auto: 모델이 올라가 있거나 여유가 있는 GPU를 자동 선택)"),
         init_image_list: List[UploadFile] = File(..., description="업로드할 이미지 파일들"),
         mask_image_list: List[UploadFile] = File(..., description="업로드할 이미지 파일들의 mask 파일들"),
-        current_user: Member = Depends(get_current_user),
+        current_user: CurrentMember = Depends(get_current_user),
+        ai_client: AIServerClient = Depends(get_ai_client),
+        redis: Redis = Depends(get_app_redis),
         init_input_path: Optional[str] = Form(None, description="초기 이미지를 가져올 로컬 경로", examples=[""]),
         mask_input_path: Optional[str] = Form(None, description="마스킹 이미지를 가져올 로컬 경로", examples=[""]),
         output_path: Optional[str] = Form(None, description="이미지를 저장할 로컬 경로", examples=[""])
@@ -36,14 +40,21 @@ async def cleanup(
 
     files = []
     for image in init_image_list:
-        files.append(('images', (image.filename, await image.read(), image.content_type)))
+        files.append(('images', (image.filename, image.file, image.content_type)))
     for mask in mask_image_list:
-        files.append(('masks', (mask.filename, await mask.read(), mask.content_type)))
+        files.append(('masks', (mask.filename, mask.file, mask.content_type)))
 
     form_data = {
         "gpu_device": gpu_device
     }
 
-    json_response = requests.post(settings.AI_SERVER_URL + CLEAN_UP_URL, data=form_data, files=files).json()
+    # direct 모드면 워커가 결과를 S3에 바로 올리도록 presigned POST를 함께 전달
+    form_data["result_upload"] = await create_result_upload()
 
-    return {"task_id": json_response.get("task_id")}
+    json_response = (await ai_client.post(CLEAN_UP_URL, data=form_data, files=files)).json()
+
+    # 이벤트 스트림(/tasks/{task_id}/events)은 요청한 회원만 구독할 수 있도록 기록
+    task_id = json_response.get("task_id")
+    await register_task_owner(redis, task_id, current_user.member_id)
+
+    return {"task_id": task_id}
@@ -1,18 +1,19 @@
 from typing import Optional
 
-import requests
+from aioredis import Redis
 from fastapi import APIRouter, UploadFile, File, HTTPException, status, Response, Form, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from api.routes.members import use_tokens
-from core.config import settings
 from typing import List
 
-from dependencies import get_db, get_current_user
+from dependencies import get_db, get_current_user, get_ai_client, get_app_redis
 from enums import UseType, Role
-from models import Member
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
 from schema.tokens import TokenUse
+from utils.task_events import register_task_owner
 
 router = APIRouter(
     prefix="/clip"
@@ -22,13 +23,15 @@ CLIP_URL = "/generation/clip"
 
 @router.post("")
 async def clip(model: str = Form("ViT-L-14/openai", description="사용할 모델"),
-               gpu_device: int = Form(..., description="사용할 GPU의 장치 번호"),
+               gpu_device: str = Form("auto", description="사용할 GPU의 장치 번호 (auto: 모델이 올라가 있거나 여유가 있는 GPU를 자동 선택)"),
                image_list: List[UploadFile] = File(None, description="업로드할 이미지 파일들"),
                mode: Optional[str] = Form(None, description="interrogate 모드 설정. fast/classic/negative", examples=[""]),
                caption: Optional[str] = Form(None, description="이미지 caption을 직접 설정할 경우 적는 prompt", examples=[""]),
                batch_size: Optional[int] = Form(1024, description="한 번에 처리할 수 있는 데이터의 양"),
-               session: Session = Depends(get_db),
-               current_user: Member = Depends(get_current_user)):
+               session: AsyncSession = Depends(get_db),
+               current_user: CurrentMember = Depends(get_current_user),
+               ai_client: AIServerClient = Depends(get_ai_client),
+               redis: Redis = Depends(get_app_redis)):
 
     cost = 1  # 토큰 차감 수
     # 토큰 개수 모자랄 경우 먼저 에러 처리
@@ -43,8 +46,12 @@ async def clip(model: str = Form("ViT-L-14/openai", description="사용할 모
         "batch_size":batch_size
     }
 
-    files = [('images', (image.filename, await image.read(), image.content_type)) for image in image_list]
+    files = [('images', (image.filename, image.file, image.content_type)) for image in image_list]
 
-    json_response = requests.post(settings.AI_SERVER_URL + CLIP_URL, files=files, data=form_data).json()
+    json_response = (await ai_client.post(CLIP_URL, files=files, data=form_data)).json()
 
-    return {"task_id": json_response.get("task_id")}
\ No newline at end of file
+    # 이벤트 스트림(/tasks/{task_id}/events)은 요청한 회원만 구독할 수 있도록 기록
+    task_id = json_response.get("task_id")
+    await register_task_owner(redis, task_id, current_user.member_id)
+
+    return {"task_id": task_id}
\ No newline at end of file
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, status, HTTPException
 from starlette.responses import Response
 
 from dependencies import get_current_user
-from models import Member
+from schema.members import CurrentMember
 from schema.logs import *
 from utils.s3 import delete_files_async
 
@@ -13,7 +13,7 @@ router = APIRouter(
 
 @router.get("")
 async def get_log_list(
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     logs = await (
         GenerationLog.find(GenerationLog.member_id == member.member_id)
@@ -32,7 +32,7 @@ async def get_log_list(
 @router.get("/{log_id}")
 async def get_log_by_id(
         log_id: PydanticObjectId,
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     log = await GenerationLog.get(log_id)
 
@@ -52,7 +52,7 @@ async def get_log_by_id(
 @router.delete("/{log_id}")
 async def delete_log(
         log_id: PydanticObjectId,
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     log = await GenerationLog.get(log_id)
 
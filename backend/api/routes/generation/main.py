@@ -1,23 +1,23 @@
-import io
 import json
-import zipfile
 from datetime import datetime
 
-import requests
-from fastapi import APIRouter, status, Depends
-from sqlalchemy.orm import Session
-from starlette.responses import JSONResponse
+import httpx
+from aioredis import Redis
+from fastapi import APIRouter, status, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse, StreamingResponse
 
 from api.routes.generation import tti, iti, inpainting, rembg, cleanup, clip, preset, log
 from api.routes.members import use_tokens
-from core.config import settings
-from dependencies import get_db, get_current_user
+from dependencies import get_db, get_current_user, get_current_user_from_query, get_ai_client, get_app_redis
 from enums import SchedulerType
 from enums import UseType
-from models import Member
+from schema.members import CurrentMember
 from schema.logs import GenerationLog, SimpleGenerationLog
 from schema.tokens import TokenUse
-from utils.s3 import upload_files_async
+from utils.ai_client import AIServerClient
+from utils.s3 import upload_zip_stream_async
+from utils.task_events import is_task_owner, stream_task_events
 
 router = APIRouter(
     prefix="/generation",
@@ -35,21 +35,63 @@ router.include_router(log.router)
 
 
 @router.get("/schedulers")
-def get_scheduler_list():
+async def get_scheduler_list(ai_client: AIServerClient = Depends(get_ai_client)):
+    # AI 서버에 등록된 스케줄러 목록을 그대로 전달 (AI 서버에 연결할 수 없으면 enum 목록 사용)
+    try:
+        response = await ai_client.get("/generation/schedulers")
+        if response.status_code == 200:
+            return response.json()
+    except httpx.HTTPError:
+        pass
+
     return [scheduler.value for scheduler in SchedulerType]
 
 
+@router.get("/tasks/{task_id}/events")
+async def get_task_events(
+        task_id: str,
+        member: CurrentMember = Depends(get_current_user_from_query),
+        redis: Redis = Depends(get_app_redis),
+):
+    # polling 대신 task 진행/완료 시점에 이벤트를 받음 (SUCCESS를 받은 뒤 /tasks/{task_id}를 한 번 호출해 결과 조회)
+    if not await is_task_owner(redis, task_id, member.member_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="존재하지 않는 작업입니다.")
+
+    return StreamingResponse(
+        stream_task_events(redis, task_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
 @router.get("/tasks/{task_id}")
 async def get_task_status(
         task_id: str,
-        member: Member = Depends(get_current_user),
-        session: Session = Depends(get_db),
+        member: CurrentMember = Depends(get_current_user),
+        session: AsyncSession = Depends(get_db),
+        ai_client: AIServerClient = Depends(get_ai_client),
 ):
-    response = requests.get(settings.AI_SERVER_URL + f"/generation/tasks/{task_id}")
+    # 결과 ZIP은 메모리에 모으지 않고 받는 대로 S3로 전달
+    response = await ai_client.get(f"/generation/tasks/{task_id}", stream=True)
 
     if response.headers['content-type'] == "application/json":
+        await response.aread()
         response = response.json()
 
+        # direct 모드: 워커가 이미 S3에 올렸으므로 Log 저장과 토큰 차감만 진행
+        if response.get("task_status") == "SUCCESS" and response.get("result_data_type") == "image_urls":
+            return await save_generation_result(
+                response.get("task_name"),
+                response.get("task_arguments"),
+                response.get("result_data").get("urls"),
+                datetime.now(),
+                member,
+                session,
+            )
+
         if response.get("task_status") == "SUCCESS" and response.get("task_name") == "clip":
             token_use = TokenUse(
                 cost=1,
@@ -58,61 +100,65 @@ async def get_task_status(
                 model=response.get("task_arguments").get("model")
             )
 
-            use_tokens(token_use, session, member)
+            await use_tokens(token_use, session, member)
 
         return response
 
     elif response.headers['content-type'] == "application/zip":
-        zip_file_bytes = io.BytesIO(response.content)
-
-        # ZIP 파일에서 이미지 추출
-        image_list = []
-        with zipfile.ZipFile(zip_file_bytes) as zip_file:
-            for name in zip_file.namelist():
-                image_data = zip_file.read(name)
-                image_stream = io.BytesIO(image_data)
-                image_list.append(image_stream)
-
         now = datetime.now()
         formatted_date = now.strftime("%Y%m%d")
         formatted_time = now.strftime("%H%M%S%f")
 
-        # S3에 이미지 업로드
-        image_url_list = await upload_files_async(image_list, formatted_date, formatted_time)
-
-        # Log 생성
-        task_name = response.headers['Task-Name']
-        task_args = json.loads(response.headers['Task-Arguments'])
-
-        log = GenerationLog(
-            generation_type=task_name,
-            member_id=member.member_id,
-            date=now,
-            num_of_generated_images=len(image_url_list),
-            image_url_list=image_url_list,
-            **task_args
+        # S3에 이미지 업로드 (ZIP 엔트리를 도착하는 순서대로 multipart 업로드)
+        try:
+            image_url_list = await upload_zip_stream_async(response.aiter_bytes(), formatted_date, formatted_time)
+        finally:
+            await response.aclose()
+
+        return await save_generation_result(
+            response.headers['Task-Name'],
+            json.loads(response.headers['Task-Arguments']),
+            image_url_list,
+            now,
+            member,
+            session,
         )
 
-        saved_log = await log.insert()
-        simple_saved_log = SimpleGenerationLog.from_orm(saved_log)
-
-        # 토큰 차감
-        token_use = TokenUse(
-            cost=len(image_url_list),
-            use_type=UseType(task_name),
-            image_quantity=len(image_url_list),
-            model=task_args.get("model")
-        )
-
-        use_tokens(token_use, session, member)
-
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "task_name": task_name,
-                "task_status": "SUCCESS",
-                "result_data_type": "image",
-                "result_data_log": json.loads(simple_saved_log.model_dump_json()),
-                "result_data": image_url_list
-            }
-        )
+    await response.aclose()
+
+
+async def save_generation_result(task_name: str, task_args: dict, image_url_list: list[str], now: datetime,
+                                 member: CurrentMember, session: AsyncSession):
+    # Log 생성
+    log = GenerationLog(
+        generation_type=task_name,
+        member_id=member.member_id,
+        date=now,
+        num_of_generated_images=len(image_url_list),
+        image_url_list=image_url_list,
+        **task_args
+    )
+
+    saved_log = await log.insert()
+    simple_saved_log = SimpleGenerationLog.from_orm(saved_log)
+
+    # 토큰 차감
+    token_use = TokenUse(
+        cost=len(image_url_list),
+        use_type=UseType(task_name),
+        image_quantity=len(image_url_list),
+        model=task_args.get("model")
+    )
+
+    await use_tokens(token_use, session, member)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "task_name": task_name,
+            "task_status": "SUCCESS",
+            "result_data_type": "image",
+            "result_data_log": json.loads(simple_saved_log.model_dump_json()),
+            "result_data": image_url_list
+        }
+    )
@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from starlette.responses import JSONResponse, Response
 
 from dependencies import get_current_user
-from models import Member
+from schema.members import CurrentMember
 from schema.presets import *
 
 router = APIRouter(
@@ -13,7 +13,7 @@ router = APIRouter(
 
 @router.get("")
 async def get_preset_list(
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     presets = await (
         GenerationPreset.find(GenerationPreset.member_id == member.member_id)
@@ -30,7 +30,7 @@ async def get_preset_list(
 @router.post("")
 async def create_preset(
         request: GenerationPreset,
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     all_none = all(
         getattr(request, field) is None
@@ -53,7 +53,7 @@ async def create_preset(
 @router.get("/{preset_id}")
 async def get_preset_by_id(
         preset_id: PydanticObjectId,
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     preset = await GenerationPreset.get(preset_id)
 
@@ -74,7 +74,7 @@ async def get_preset_by_id(
 async def update_preset(
         preset_id: PydanticObjectId,
         request: GenerationPresetUpdate,
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     preset = await GenerationPreset.get(preset_id)
 
@@ -100,7 +100,7 @@ async def update_preset(
 @router.delete("/{preset_id}")
 async def delete_preset(
         preset_id: PydanticObjectId,
-        member: Member = Depends(get_current_user)
+        member: CurrentMember = Depends(get_current_user)
 ):
     preset = await GenerationPreset.get(preset_id)
 
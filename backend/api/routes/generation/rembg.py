@@ -1,12 +1,14 @@
 from typing import List, Optional
 
-import requests
+from aioredis import Redis
 from fastapi import APIRouter, status, Form, UploadFile, File, HTTPException, Depends
 
-from core.config import settings
-from dependencies import get_current_user
+from dependencies import get_current_user, get_ai_client, get_app_redis
 from enums import GPUEnvironment, Role
-from models import Member
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
+from utils.s3 import create_result_upload
+from utils.task_events import register_task_owner
 
 router = APIRouter(
     prefix="/remove-bg",
@@ -18,13 +20,15 @@ REMOVE_BG_URL = "/generation/remove-bg"
 @router.post("/{gpu_env}")
 async def remove_background(
         gpu_env: GPUEnvironment,
-        gpu_device: int = Form(..., description="사용할 GPU의 장치 번호"),
+        gpu_device: str = Form("auto", description="사용할 GPU의 장치 번호 (auto: 모델이 올라가 있거나 여유가 있는 GPU를 자동 선택)"),
         model: str = Form("briaai/RMBG-1.4", description="사용할 모델"),
         batch_size: Optional[int] = Form(1, ge=1, description="한 번에 처리할 수 있는 데이터의 양"),
         image_list: List[UploadFile] = File(..., description="업로드할 이미지 파일들"),
         input_path: Optional[str] = Form(None, description="이미지를 가져올 로컬 경로", examples=[""]),
         output_path: Optional[str] = Form(None, description="이미지를 저장할 로컬 경로", examples=[""]),
-        current_user: Member = Depends(get_current_user)
+        current_user: CurrentMember = Depends(get_current_user),
+        ai_client: AIServerClient = Depends(get_ai_client),
+        redis: Redis = Depends(get_app_redis),
 ):
     if gpu_env == GPUEnvironment.local:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="local 버전은 현재 준비중입니다.")
@@ -40,8 +44,15 @@ async def remove_background(
         "batch_size": batch_size,
     }
 
-    files = [('images', (image.filename, await image.read(), image.content_type)) for image in image_list]
+    # direct 모드면 워커가 결과를 S3에 바로 올리도록 presigned POST를 함께 전달
+    form_data["result_upload"] = await create_result_upload()
 
-    json_response = requests.post(settings.AI_SERVER_URL + REMOVE_BG_URL, files=files, data=form_data).json()
+    files = [('images', (image.filename, image.file, image.content_type)) for image in image_list]
 
-    return {"task_id": json_response.get("task_id")}
+    json_response = (await ai_client.post(REMOVE_BG_URL, files=files, data=form_data)).json()
+
+    # 이벤트 스트림(/tasks/{task_id}/events)은 요청한 회원만 구독할 수 있도록 기록
+    task_id = json_response.get("task_id")
+    await register_task_owner(redis, task_id, current_user.member_id)
+
+    return {"task_id": task_id}
@@ -2,13 +2,16 @@ import random
 from pathlib import Path
 from typing import Optional
 
-import requests
+from aioredis import Redis
 from fastapi import APIRouter, status, HTTPException, Form, Depends
 
 from core.config import settings
-from dependencies import get_current_user
+from dependencies import get_current_user, get_ai_client, get_app_redis
 from enums import GPUEnvironment, SchedulerType, Role
-from models import Member
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
+from utils.s3 import create_result_upload
+from utils.task_events import register_task_owner
 
 router = APIRouter(
     prefix="/txt-to-img",
@@ -17,10 +20,12 @@ router = APIRouter(
 base_models = settings.BASE_MODEL_NAME.split("|")
 
 @router.post("/{gpu_env}")
-def text_to_image(
+async def text_to_image(
         gpu_env: GPUEnvironment,
-        gpu_device: int = Form(..., description="사용할 GPU의 장치 번호"),
-        current_user: Member = Depends(get_current_user),
+        gpu_device: str = Form("auto", description="사용할 GPU의 장치 번호 (auto: 모델이 올라가 있거나 여유가 있는 GPU를 자동 선택)"),
+        current_user: CurrentMember = Depends(get_current_user),
+        ai_client: AIServerClient = Depends(get_ai_client),
+        redis: Redis = Depends(get_app_redis),
         model: str = Form(base_models[0]),
         scheduler: Optional[SchedulerType] = Form(None, description="각 샘플링 단계에서의 노이즈 수준을 제어할 샘플링 메소드"),
         prompt: str = Form(..., description="이미지를 생성할 텍스트 프롬프트"),
@@ -70,6 +75,13 @@ def text_to_image(
         "output_path": output_path,
     }
 
-    json_response = requests.post(settings.AI_SERVER_URL + "/generation/txt-to-img", data=form_data).json()
+    # direct 모드면 워커가 결과를 S3에 바로 올리도록 presigned POST를 함께 전달
+    form_data["result_upload"] = await create_result_upload()
 
-    return {"task_id": json_response.get("task_id")}
+    json_response = (await ai_client.post("/generation/txt-to-img", data=form_data)).json()
+
+    # 이벤트 스트림(/tasks/{task_id}/events)은 요청한 회원만 구독할 수 있도록 기록
+    task_id = json_response.get("task_id")
+    await register_task_owner(redis, task_id, current_user.member_id)
+
+    return {"task_id": task_id}
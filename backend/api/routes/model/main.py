@@ -1,14 +1,12 @@
-from typing import Iterator
-
-import requests
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 from starlette.responses import StreamingResponse
 
 from api.routes.model import model
-from core.config import settings
-from dependencies import get_db, get_current_user
+from dependencies import get_db, get_current_user, get_ai_client
 from models import Member
+from utils.ai_client import AIServerClient
 
 router = APIRouter(
     prefix="/model",
@@ -18,34 +16,33 @@ router = APIRouter(
 
 router.include_router(model.router)
 
+CHUNK_SIZE = 64 * 1024  # 64 KB
+
 
 @router.get("/tasks/{task_id}")
 async def get_task_status(
-        task_id: str
+        task_id: str,
+        ai_client: AIServerClient = Depends(get_ai_client),
 ):
-    response = requests.get(settings.AI_SERVER_URL + f"/model/tasks/{task_id}", stream=True)
+    response = await ai_client.get(f"/model/tasks/{task_id}", stream=True)
 
     if response.headers['content-type'] == "application/json":
-        response = response.json()
-        return response
+        await response.aread()
+        await response.aclose()
+        return response.json()
 
     elif response.headers['content-type'] == "application/zip":
         content_disposition = response.headers["content-disposition"]
         filename = content_disposition.split("filename=")[-1].rstrip()
 
+        # AI 서버 응답을 메모리에 모으지 않고 그대로 전달, 전송이 끝나면 커넥션을 풀에 반환
         return StreamingResponse(
-            iter_stream(response.raw),
+            response.aiter_bytes(CHUNK_SIZE),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
-            }
+            },
+            background=BackgroundTask(response.aclose),
         )
 
-
-def iter_stream(response_raw) -> Iterator[bytes]:
-    chunk_size = 8192  # 8 KB
-    while True:
-        chunk = response_raw.read(chunk_size)
-        if not chunk:
-            break
-        yield chunk
\ No newline at end of file
+    await response.aclose()
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
-import requests
-from core.config import settings
-from dependencies import get_current_user
-from models import Member
+import httpx
+from dependencies import get_current_user, get_ai_client
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
 
 router = APIRouter(
     prefix="",
@@ -12,10 +12,10 @@ router = APIRouter(
 
 
 @router.get("/{member_id}")
-async def get_model_names_from_ai(member_id: str):
+async def get_model_names_from_ai(member_id: str, ai_client: AIServerClient = Depends(get_ai_client)):
     try:
         # AI 서버에 요청 보내기
-        response = requests.get(f"{settings.AI_SERVER_URL}/model/{member_id}")
+        response = await ai_client.get(f"/model/{member_id}")
 
         # 요청 성공 시
         if response.status_code == 200:
@@ -27,15 +27,15 @@ async def get_model_names_from_ai(member_id: str):
         else:
             raise HTTPException(status_code=response.status_code, detail="AI 서버 요청 중 에러 발생.")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"AI 서버와의 통신 중 에러 발생: {str(e)}")
 
 @router.get("/{model_name}/download")
-async def model_download(model_name: str, current_user: Member = Depends(get_current_user)):
+async def model_download(model_name: str, current_user: CurrentMember = Depends(get_current_user),
+                         ai_client: AIServerClient = Depends(get_ai_client)):
     member_id = current_user.member_id
     try:
-        ai_server_url = f"{settings.AI_SERVER_URL}/model/{model_name}/download?member_id={member_id}"
-        response = requests.get(ai_server_url)
+        response = await ai_client.get(f"/model/{model_name}/download", params={"member_id": member_id})
 
         if response.status_code == 200:
             return {"task_id": response.json().get("task_id")}
@@ -45,5 +45,5 @@ async def model_download(model_name: str, current_user: Member = Depends(get_cur
         else:
             raise HTTPException(status_code=response.status_code, detail=f"응답 중 오류 발생 : {response.text}")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"통신 중 에러 발생: {str(e)}")
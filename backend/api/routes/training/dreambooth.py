@@ -1,16 +1,15 @@
 from typing import Optional, List
 
-import requests
 from fastapi import APIRouter, UploadFile, File, Form, status, HTTPException, Response, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 import json
 
 from api.routes.members import use_tokens
-from core.config import settings
-from dependencies import get_db, get_current_user
+from dependencies import get_db, get_current_user, get_ai_client
 from enums import GPUEnvironment, UseType, Role
-from models import Member
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
 from schema.tokens import TokenUse
 
 router = APIRouter(
@@ -22,7 +21,8 @@ router = APIRouter(
 async def dreambooth(
         gpu_env: Optional[GPUEnvironment] = GPUEnvironment.remote,
         gpu_device: int = Form(..., description="사용할 GPU의 장치 번호"),
-        current_user: Member = Depends(get_current_user),
+        current_user: CurrentMember = Depends(get_current_user),
+        ai_client: AIServerClient = Depends(get_ai_client),
         is_inpaint: str = Form(None, description="inpainting 모델 학습 여부 (True, ' ')", examples=["True", ""]),
         find_hugging_face: str = Form(None, description="hugging face 모델 여부 (True, ' ')", examples=["", "True"]),
         pretrained_model_name_or_path: str = Form(..., description="초기 모델입니다.",
@@ -159,11 +159,11 @@ async def dreambooth(
     files = []
 
     files.extend(
-        [('instance_image_list', (image.filename, await image.read(), image.content_type)) for image in
+        [('instance_image_list', (image.filename, image.file, image.content_type)) for image in
          instance_image_list])
     files.extend(
-        [('class_image_list', (image.filename, await image.read(), image.content_type)) for image in class_image_list])
+        [('class_image_list', (image.filename, image.file, image.content_type)) for image in class_image_list])
 
-    json_response = requests.post(settings.AI_SERVER_URL + "/training/dreambooth", files=files, data=form_data).json()
+    json_response = (await ai_client.post("/training/dreambooth", files=files, data=form_data)).json()
 
     return {"task_id": json_response.get("task_id")}
\ No newline at end of file
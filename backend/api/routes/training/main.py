@@ -3,19 +3,18 @@ import json
 import zipfile
 from datetime import datetime
 
-import requests
 from fastapi import APIRouter, status, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from api.routes.members import use_tokens
 from api.routes.training import dreambooth
-from core.config import settings
-from dependencies import get_db, get_current_user
+from dependencies import get_db, get_current_user, get_ai_client
 from enums import UseType
-from models import Member
+from schema.members import CurrentMember
 from schema.logs import GenerationLog, SimpleGenerationLog
 from schema.tokens import TokenUse
+from utils.ai_client import AIServerClient
 from utils.s3 import upload_files_async
 
 router = APIRouter(
@@ -28,10 +27,11 @@ router.include_router(dreambooth.router)
 @router.get("/tasks/{task_id}")
 async def get_task_status(
         task_id: str,
-        member: Member = Depends(get_current_user),
-        session: Session = Depends(get_db),
+        member: CurrentMember = Depends(get_current_user),
+        session: AsyncSession = Depends(get_db),
+        ai_client: AIServerClient = Depends(get_ai_client),
 ):
-    response = requests.get(settings.AI_SERVER_URL + f"/training/tasks/{task_id}").json()
+    response = (await ai_client.get(f"/training/tasks/{task_id}")).json()
 
     if response.get("task_status") == "SUCCESS":
         task_arguments = response.get("task_arguments")
@@ -45,6 +45,6 @@ async def get_task_status(
             model=model
         )
 
-        use_tokens(token_use, session, member)
+        await use_tokens(token_use, session, member)
 
     return response
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import (
     AnyUrl,
@@ -18,6 +18,14 @@ class Settings(BaseSettings):
     BACKEND_DOMAIN: str
     AI_SERVER_URL: str
 
+    # AI SERVER CLIENT
+    AI_SERVER_TIMEOUT: float = 30
+    AI_SERVER_CONNECT_TIMEOUT: float = 5
+    AI_SERVER_MAX_CONNECTIONS: int = 100
+    AI_SERVER_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    AI_SERVER_RETRIES: int = 3
+    AI_SERVER_RETRY_BACKOFF: float = 0.5
+
     # JWT
     ENCODE_ALGORITHM: str
     JWT_SECRET_KEY: str
@@ -29,11 +37,30 @@ class Settings(BaseSettings):
     AWS_S3_REGION_STATIC: str
     AWS_S3_ACCESS_KEY: str
     AWS_S3_SECRET_KEY: str
+    S3_UPLOAD_CONCURRENCY: int = 32     # 동시에 진행하는 업로드 수 (S3 클라이언트 커넥션 풀 크기)
+    S3_MULTIPART_CHUNK_SIZE_MB: int = 8     # multipart 업로드의 part 크기 (S3 최소 5MB)
+    AWS_S3_ENDPOINT_URL: Optional[str] = None   # MinIO / moto 등 S3 호환 스토리지 주소 (없으면 AWS S3)
+
+    # RESULT UPLOAD
+    # proxy: AI 서버의 결과 ZIP을 backend가 받아 S3에 업로드
+    # direct: backend가 발급한 presigned POST로 AI 워커가 S3에 바로 업로드 (backend는 Log 저장 / 토큰 차감만)
+    RESULT_UPLOAD_MODE: Literal["proxy", "direct"] = "proxy"
+    RESULT_UPLOAD_URL_EXPIRES: int = 86400      # presigned POST 유효 시간 (대기 시간을 포함하므로 넉넉하게)
 
     # REDIS
     REDIS_HOST: str
     REDIS_PORT: str
 
+    # MEMBER CACHE (인증된 회원 조회 캐시)
+    MEMBER_CACHE_TTL: int = 60              # Redis에 보관하는 시간 (초)
+    MEMBER_CACHE_LOCAL_TTL: int = 5         # 프로세스 메모리에 보관하는 시간 (다른 워커의 변경이 반영되는 최대 지연)
+    MEMBER_CACHE_LOCAL_SIZE: int = 1024     # 프로세스 메모리에 보관하는 최대 회원 수 (LRU)
+
+    # TASK EVENTS (SSE)
+    TASK_EVENT_KEEPALIVE_SECONDS: int = 15      # 프록시가 연결을 끊지 않도록 보내는 keep-alive 주기
+    TASK_EVENT_STREAM_TIMEOUT: int = 3600       # 완료 이벤트가 오지 않을 때 스트림을 닫는 시간
+    TASK_OWNER_TTL: int = 86400                 # task를 요청한 회원 정보를 보관하는 시간 (이벤트 구독 권한 확인용)
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -48,6 +75,14 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    # DB CONNECTION POOL
+    DB_ECHO: bool = False           # True면 실행되는 SQL을 모두 출력
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800     # 오래된 커넥션은 다시 연결 (초)
+
+    # alembic 마이그레이션용 (동기 드라이버)
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -60,6 +95,19 @@ class Settings(BaseSettings):
             database=self.POSTGRES_DB
         ).render_as_string(hide_password=False)
 
+    # 애플리케이션용 (비동기 드라이버)
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> PostgresDsn:
+        return URL.create(
+            drivername="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_SERVER,
+            port=self.POSTGRES_PORT,
+            database=self.POSTGRES_DB
+        ).render_as_string(hide_password=False)
+
     # MONGO DB
     MONGO_DB_PORT: int
     MONGO_DB_USERNAME: str
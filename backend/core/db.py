@@ -1,9 +1,16 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from core.config import settings
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), echo=True) # echo -> prints SQL
-Session = sessionmaker(bind=engine)
+engine = create_async_engine(
+    str(settings.SQLALCHEMY_ASYNC_DATABASE_URI),
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+# commit 이후 속성에 접근할 때 다시 조회(암묵적 I/O)하지 않도록 expire_on_commit=False
+Session = async_sessionmaker(bind=engine, expire_on_commit=False)
 Base = declarative_base()
-
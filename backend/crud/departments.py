@@ -1,9 +1,9 @@
-from fastapi import Depends
-from dependencies import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Department
 from schema.departments import DepartmentRead
 
-def get_departments(session: Depends(get_db)):
-    departments = session.query(Department).all()
+async def get_departments(session: AsyncSession):
+    departments = (await session.execute(select(Department))).scalars().all()
     department_reads = [DepartmentRead.from_orm(department) for department in departments]
-    return department_reads
\ No newline at end of file
+    return department_reads
@@ -1,31 +1,38 @@
 from datetime import datetime
 
-from fastapi import Depends, HTTPException
-from sqlalchemy import cast, Date
+from fastapi import HTTPException
+from sqlalchemy import cast, Date, select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from core.security import hash_password
-from dependencies import get_db
 from models import Member
 from schema.members import MemberCreate, MemberRead
 from typing import List
 from enums import Role
 
-def get_all_members(session: Depends(get_db)):
-    return session.query(Member).all()
+# MemberRead는 부서 이름을 사용하므로 비동기 세션에서는 부서를 함께 조회 (lazy loading 불가)
 
-def get_member_by_login_id(session: Depends(get_db), login_id: str):
-    return session.query(Member).filter(Member.login_id == login_id).first()
+async def get_all_members(session: AsyncSession):
+    return (await session.execute(select(Member).options(joinedload(Member.department)))).scalars().all()
 
-def get_members_by_department_id(session: Depends(get_db), department_id: int):
-    return session.query(Member).filter(Member.department_id == department_id).all()
+async def get_member_by_login_id(session: AsyncSession, login_id: str):
+    return (await session.execute(select(Member).filter(Member.login_id == login_id))).scalars().first()
 
-def get_member_by_member_id(session: Depends(get_db), member_id: int):
-    return session.query(Member).filter(Member.member_id == member_id).first()
+async def get_members_by_department_id(session: AsyncSession, department_id: int):
+    return (await session.execute(select(Member).filter(Member.department_id == department_id))).scalars().all()
 
-def get_members_by_member_ids(session: Depends(get_db), member_ids: List[int]):
-    return session.query(Member).filter(Member.member_id.in_(member_ids)).all()
+async def get_member_by_member_id(session: AsyncSession, member_id: int):
+    return (await session.execute(select(Member).filter(Member.member_id == member_id))).scalars().first()
 
-def create_member(session: Depends(get_db), member: MemberCreate):
+async def get_member_with_department(session: AsyncSession, member_id: int):
+    return (await session.execute(select(Member).options(joinedload(Member.department))
+                                  .filter(Member.member_id == member_id))).scalars().one_or_none()
+
+async def get_members_by_member_ids(session: AsyncSession, member_ids: List[int]):
+    return (await session.execute(select(Member).filter(Member.member_id.in_(member_ids)))).scalars().all()
+
+async def create_member(session: AsyncSession, member: MemberCreate):
     hashed_password = hash_password(member.password)
     db_member = Member(
         login_id=member.login_id,
@@ -39,28 +46,30 @@ def create_member(session: Depends(get_db), member: MemberCreate):
 
     try:
         session.add(db_member)
-        session.commit()
-        session.refresh(db_member)
+        await session.commit()
+        await session.refresh(db_member)
         return db_member
 
     except SQLAlchemyError as e:
         raise HTTPException(status_code=400, detail=str(e.orig))
 
-def get_guests(session: Depends(get_db)):
-    guests = session.query(Member).filter(Member.role == Role.guest).all()
+async def get_guests(session: AsyncSession):
+    guests = (await session.execute(select(Member).options(joinedload(Member.department))
+                                    .filter(Member.role == Role.guest))).scalars().all()
     return [MemberRead.from_orm(guest) for guest in guests]
 
-def update_member_role(session: Depends(get_db), member: Member, role: Role):
+async def update_member_role(session: AsyncSession, member: Member, role: Role):
     member.role = role
-    session.commit()
-    session.refresh(member)
+    await session.commit()
+    await session.refresh(member)
 
-def get_expired_guests(session: Depends(get_db),
-                       three_days_ago: datetime,
-                       offset: int,
-                       limit: int):
-    return (session.query(Member)
-            .filter(Member.role == Role.guest, cast(Member.create_date, Date) < cast(three_days_ago, Date))
-            .offset(offset)
-            .limit(limit)
-            .all())
\ No newline at end of file
+async def get_expired_guests(session: AsyncSession,
+                             three_days_ago: datetime,
+                             offset: int,
+                             limit: int):
+    return (await session.execute(
+        select(Member)
+        .filter(Member.role == Role.guest, cast(Member.create_date, Date) < cast(three_days_ago, Date))
+        .offset(offset)
+        .limit(limit)
+    )).scalars().all()
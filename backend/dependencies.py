@@ -3,23 +3,24 @@ from typing import Annotated
 import aioredis
 from aioredis import Redis
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from jose import jwt, JWTError, ExpiredSignatureError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import Member
 from core.db import Session
 from core.config import settings
+from crud import members as members_crud
+from schema.members import CurrentMember
+from utils.ai_client import AIServerClient
+from utils.member_cache import member_cache
 
 # Access 토큰만을 리턴
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='api/auth/login')
 
 
-def get_db():
-    db = Session()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_db():
+    async with Session() as session:
+        yield session
 
 
 async def get_redis() -> Redis:
@@ -33,7 +34,29 @@ async def get_redis() -> Redis:
         await redis.close()
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)], session: Session = Depends(get_db)):
+def get_app_redis(request: Request) -> Redis:
+    # lifespan에서 만든 공용 커넥션 풀 (decode_responses=True)
+    return request.app.state.redis
+
+
+def get_ai_client(request: Request) -> AIServerClient:
+    return request.app.state.ai_client
+
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)],
+                           session: AsyncSession = Depends(get_db)) -> CurrentMember:
+    return await authenticate_token(token, session)
+
+
+async def get_current_user_from_query(token: Annotated[str, Query(description="Access 토큰")],
+                                      session: AsyncSession = Depends(get_db)) -> CurrentMember:
+    # EventSource는 Authorization 헤더를 보낼 수 없으므로 SSE 요청은 query의 Access 토큰으로 인증
+    return await authenticate_token(token, session)
+
+
+async def authenticate_token(token: str, session: AsyncSession) -> CurrentMember:
+    # 식별 정보 / 역할만 필요한 요청은 캐시에서 바로 응답 (세션은 사용하지 않으면 커넥션을 가져오지 않음)
+    # 회원 정보를 수정해야 하면 member_id로 DB에서 다시 조회하고, 수정 후 member_cache.invalidate() 호출
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ENCODE_ALGORITHM])
         login_id: str = payload.get('sub')
@@ -47,13 +70,19 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)], sessio
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail='올바르지 않은 유형의 토큰입니다.')
 
-        member = session.query(Member).filter(Member.login_id == login_id).first()
+        cached_member = await member_cache.get(login_id)
+        if cached_member:
+            return cached_member
+
+        member = await members_crud.get_member_by_login_id(session, login_id)
 
         if not member:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail='존재하지 않는 유저입니다.')
 
-        return member
+        current_member = CurrentMember.from_orm(member)
+        await member_cache.set(current_member)
+        return current_member
 
     except ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
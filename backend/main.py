@@ -1,7 +1,8 @@
 from contextlib import asynccontextmanager
 
+import aioredis
 import uvicorn
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from beanie import init_beanie
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -14,16 +15,20 @@ from models import *
 from scheduler import expire_tokens, delete_guests
 from schema.logs import GenerationLog
 from schema.presets import GenerationPreset
+from utils.ai_client import AIServerClient
+from utils.member_cache import member_cache
+from utils.s3 import s3_upload_engine
 
 
 # 생명주기 설정
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # DB Table 생성 (존재하지 않는 테이블만 생성)
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
 
-    # Scheduler 설정
-    scheduler = BackgroundScheduler()
+    # Scheduler 설정 (작업이 비동기 DB 세션을 사용하므로 이벤트 루프에서 실행)
+    scheduler = AsyncIOScheduler()
     scheduler.add_job(expire_tokens, 'cron', hour=0, minute=0)  # 만료 TokenUsage 삭제 스케줄러
     scheduler.add_job(delete_guests, 'cron', hour=0, minute=0)  # 만료 Member(role.guest) 삭제 스케줄러
     scheduler.start()
@@ -41,8 +46,20 @@ async def lifespan(app: FastAPI):
     mongo_database = client.get_database("defectstudio")
     await init_beanie(database=mongo_database, document_models=[GenerationPreset, GenerationLog])
 
+    # AI 서버 HTTP 클라이언트 (커넥션 풀 재사용)
+    app.state.ai_client = AIServerClient()
+
+    # Redis 커넥션 풀 (SSE 구독 / task 소유자 확인 등에서 요청마다 새로 연결하지 않고 공유)
+    app.state.redis = await aioredis.from_url(f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+                                              decode_responses=True)
+
     yield
+    await app.state.ai_client.aclose()
+    await app.state.redis.close()
+    await s3_upload_engine.close()
+    await member_cache.close()
     scheduler.shutdown()
+    await engine.dispose()
 
 
 # FastAPI Application 생성 및 설정
@@ -2,14 +2,15 @@ from core.db import Session
 from datetime import datetime, timedelta
 
 from crud import tokens as tokens_crud, members as members_crud
+from utils.member_cache import member_cache
 
-def expire_tokens(batch_size=100):
-    with Session() as session:
+async def expire_tokens(batch_size=100):
+    async with Session() as session:
         current_date = datetime.now()
         offset = 0
 
         while True:
-            expired_tokens = tokens_crud.get_expired_active_tokens_with_usages_and_members(session, current_date, offset=offset, limit=batch_size)
+            expired_tokens = await tokens_crud.get_expired_active_tokens_with_usages_and_members(session, current_date, offset=offset, limit=batch_size)
             if not expired_tokens:
                 break
 
@@ -17,24 +18,26 @@ def expire_tokens(batch_size=100):
                 token.is_active = False
                 if member:
                     member.token_quantity -= usage.quantity
-                session.delete(usage)
-            session.commit()
+                await session.delete(usage)
+            await session.commit()
+            await member_cache.invalidate(*{member.login_id for _, _, member in expired_tokens if member})
 
             offset += batch_size
 
-def delete_guests(batch_size=100):
-    with Session() as session:
+async def delete_guests(batch_size=100):
+    async with Session() as session:
         three_days_ago = datetime.now() - timedelta(days=3)
         offset = 0
 
         while True:
-            guests = members_crud.get_expired_guests(session, three_days_ago, offset=offset, limit=batch_size)
+            guests = await members_crud.get_expired_guests(session, three_days_ago, offset=offset, limit=batch_size)
             if not guests:
                 break
 
             for guest in guests:
-                session.delete(guest)
+                await session.delete(guest)
 
-            session.commit()
+            await session.commit()
+            await member_cache.invalidate(*[guest.login_id for guest in guests])
 
-            offset += batch_size
\ No newline at end of file
+            offset += batch_size
@@ -36,6 +36,30 @@ class MemberRead(BaseModel):
             token_quantity=member.token_quantity
         )
 
+class CurrentMember(BaseModel):
+    # 인증된 회원의 캐시용 스냅샷 (세션에 묶이지 않으므로 수정이 필요하면 DB에서 다시 조회)
+    member_id: int
+    login_id: str
+    name: str
+    nickname: str
+    email: str
+    role: Role
+    department_id: Optional[int] = None
+    token_quantity: int
+
+    @classmethod
+    def from_orm(cls, member: 'Member') -> 'CurrentMember':
+        return cls(
+            member_id=member.member_id,
+            login_id=member.login_id,
+            name=member.name,
+            nickname=member.nickname,
+            email=member.email,
+            role=member.role,
+            department_id=member.department_id,
+            token_quantity=member.token_quantity
+        )
+
 class MemberReadByDepartment(BaseModel):
     member_id: int
     name: str
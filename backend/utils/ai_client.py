@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+
+from core.config import settings
+
+# 요청이 처리되지 않았음이 확실하거나(연결 실패), 여러 번 보내도 안전한 GET에서만 재시도
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class AIServerClient:
+    # Backend -> AI 서버 통신을 담당하는 비동기 HTTP 클라이언트
+    # 애플리케이션 생명주기 동안 하나의 커넥션 풀(keep-alive)을 재사용한다
+
+    def __init__(self):
+        self._client = httpx.AsyncClient(
+            base_url=settings.AI_SERVER_URL,
+            timeout=httpx.Timeout(settings.AI_SERVER_TIMEOUT, connect=settings.AI_SERVER_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.AI_SERVER_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_SERVER_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        # stream=True면 본문을 읽지 않은 응답을 반환하므로 사용 후 response.aclose()를 호출해야 한다
+        method = method.upper()
+        if kwargs.get("data") is not None:
+            kwargs["data"] = _encode_form_data(kwargs["data"])
+
+        for attempt in range(settings.AI_SERVER_RETRIES + 1):
+            is_last_attempt = attempt == settings.AI_SERVER_RETRIES
+
+            try:
+                request = self._client.build_request(method, url, **kwargs)
+                response = await self._client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if is_last_attempt:
+                    raise
+            except httpx.TransportError:
+                if is_last_attempt or method not in IDEMPOTENT_METHODS:
+                    raise
+            else:
+                if is_last_attempt or method not in IDEMPOTENT_METHODS or response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                await response.aclose()
+
+            # exponential backoff
+            await asyncio.sleep(settings.AI_SERVER_RETRY_BACKOFF * (2 ** attempt))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def _encode_form_data(data: dict) -> dict:
+    # requests와 같이 None인 필드는 보내지 않고, Path 등은 문자열로 변환 (httpx multipart는 원시 타입만 허용)
+    return {
+        key: value if isinstance(value, (str, bytes, list)) else str(value)
+        for key, value in data.items()
+        if value is not None
+    }
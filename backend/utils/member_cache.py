@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import aioredis
+
+from core.config import settings
+from schema.members import CurrentMember
+
+# login_id별 인증된 회원 정보 캐시 (프로세스 메모리 LRU -> Redis -> DB 순서로 조회)
+MEMBER_CACHE_KEY = "member_cache:{login_id}"
+
+
+class MemberCache:
+    # 역할 / 토큰 수 / 프로필이 바뀌면 invalidate()로 지워야 한다
+    # 다른 워커 프로세스의 메모리 캐시는 MEMBER_CACHE_LOCAL_TTL이 지나면 Redis에서 다시 읽음
+
+    def __init__(self):
+        self._local: OrderedDict[str, tuple[float, CurrentMember]] = OrderedDict()
+        self._redis = None
+
+    async def get_redis(self):
+        if self._redis is None:
+            self._redis = await aioredis.from_url(f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+                                                  decode_responses=True)
+        return self._redis
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def get(self, login_id: str) -> Optional[CurrentMember]:
+        cached = self._local.get(login_id)
+        if cached:
+            expired_at, member = cached
+            if time.monotonic() < expired_at:
+                self._local.move_to_end(login_id)
+                return member
+            del self._local[login_id]
+
+        try:
+            data = await (await self.get_redis()).get(MEMBER_CACHE_KEY.format(login_id=login_id))
+        except aioredis.RedisError as e:
+            # Redis에 문제가 있어도 인증은 DB 조회로 계속 진행
+            print(f"[MemberCache] Redis 조회 실패 : {e}")
+            return None
+
+        if not data:
+            return None
+
+        member = CurrentMember.model_validate_json(data)
+        self._set_local(member)
+        return member
+
+    async def set(self, member: CurrentMember):
+        self._set_local(member)
+        try:
+            await (await self.get_redis()).setex(MEMBER_CACHE_KEY.format(login_id=member.login_id),
+                                                 settings.MEMBER_CACHE_TTL, member.model_dump_json())
+        except aioredis.RedisError as e:
+            print(f"[MemberCache] Redis 저장 실패 : {e}")
+
+    async def invalidate(self, *login_ids: str):
+        for login_id in login_ids:
+            self._local.pop(login_id, None)
+        if not login_ids:
+            return
+
+        try:
+            await (await self.get_redis()).delete(*[MEMBER_CACHE_KEY.format(login_id=login_id) for login_id in login_ids])
+        except aioredis.RedisError as e:
+            print(f"[MemberCache] Redis 삭제 실패 : {e}")
+
+    def _set_local(self, member: CurrentMember):
+        self._local[member.login_id] = (time.monotonic() + settings.MEMBER_CACHE_LOCAL_TTL, member)
+        self._local.move_to_end(member.login_id)
+        while len(self._local) > settings.MEMBER_CACHE_LOCAL_SIZE:
+            self._local.popitem(last=False)
+
+
+member_cache = MemberCache()
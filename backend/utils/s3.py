@@ -1,15 +1,53 @@
 import asyncio
+import json
 import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import datetime
 from io import BytesIO
-from typing import List
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, List, Optional
 
 import aioboto3
 import boto3
 from PIL import Image
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException
 
 from core.config import settings
+from utils.zip_stream import ZipStreamEntry, iter_zip_entries
+
+
+def get_s3_client_kwargs(**config_options) -> dict:
+    # AWS_S3_ENDPOINT_URL을 지정하면 MinIO / moto 등 S3 호환 스토리지 사용 (path-style 주소)
+    kwargs = {
+        "aws_access_key_id": settings.AWS_S3_ACCESS_KEY,
+        "aws_secret_access_key": settings.AWS_S3_SECRET_KEY,
+        "region_name": settings.AWS_S3_REGION_STATIC,
+    }
+    if settings.AWS_S3_ENDPOINT_URL:
+        kwargs["endpoint_url"] = settings.AWS_S3_ENDPOINT_URL
+        config_options["s3"] = {"addressing_style": "path"}
+    kwargs["config"] = Config(**config_options)
+    return kwargs
+
+
+def get_s3_base_url() -> str:
+    if settings.AWS_S3_ENDPOINT_URL:
+        return f"{settings.AWS_S3_ENDPOINT_URL.rstrip('/')}/{settings.AWS_S3_BUCKET}"
+    return f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_S3_REGION_STATIC}.amazonaws.com"
+
+
+def get_s3_url(key: str) -> str:
+    return f"{get_s3_base_url()}/{key}"
+
+
+def get_s3_key(url: str) -> str:
+    base_url = get_s3_base_url()
+    if url.startswith(base_url + "/"):
+        return url[len(base_url) + 1:]
+    return url.split(".com/")[-1]
 
 
 # 동기 방식
@@ -18,11 +56,7 @@ def upload_files(image_list: List[BytesIO], formatted_date: str, formatted_time:
     start_time = time.time()
     print("s3 not async upload started")
     s3_urls = []
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_S3_ACCESS_KEY,
-        aws_secret_access_key=settings.AWS_S3_SECRET_KEY
-    )
+    s3_client = boto3.client('s3', **get_s3_client_kwargs())
 
     for index, image_stream in enumerate(image_list):
         image_key = f"{formatted_date}/{formatted_time}/{index + 1}"
@@ -50,20 +84,15 @@ def upload_file(s3_client, image_stream: BytesIO, key: str) -> str:
                 'ContentDisposition': 'inline'
             }
         )
-        s3_url = f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_S3_REGION_STATIC}.amazonaws.com/{key}.{format}"
-        return s3_url
+        return get_s3_url(f"{key}.{format}")
     except (BotoCoreError, ClientError) as e:
         raise HTTPException(status_code=500, detail=f"업로드 실패: {e}")
 
 def delete_files(num_of_images: int, image_url_list: List[str]):
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_S3_ACCESS_KEY,
-        aws_secret_access_key=settings.AWS_S3_SECRET_KEY
-    )
+    s3_client = boto3.client('s3', **get_s3_client_kwargs())
 
     for url in image_url_list:
-        delete_file(s3_client, url.split(".com/")[-1])
+        delete_file(s3_client, get_s3_key(url))
 
 def delete_file(s3_client, key: str):
     try:
@@ -74,66 +103,292 @@ def delete_file(s3_client, key: str):
 
 # 비동기 방식
 
-async def upload_files_async(image_list: List[BytesIO], formatted_date: str, formatted_time: str) -> List[str]:
-    start_time = time.time()
-    print("s3 async upload started")
+# 파일 앞부분(magic bytes)으로 이미지 형식 판별 (업로드 전에 PIL로 다시 열지 않음)
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+]
+IMAGE_EXTENSIONS = {"png": "png", "jpg": "jpeg", "jpeg": "jpeg", "webp": "webp", "gif": "gif", "bmp": "bmp"}
 
-    batch_size = 400 if len(image_list) > 400 else len(image_list)
-    print("Batch size:", batch_size)
 
-    s3_urls = []
-    session = aioboto3.Session()
-    async with session.client(
-        's3',
-        aws_access_key_id=settings.AWS_S3_ACCESS_KEY,
-        aws_secret_access_key=settings.AWS_S3_SECRET_KEY
-    ) as s3_client:
-
-        for i in range(0, len(image_list), batch_size):
-            batch = image_list[i:i + batch_size]
-            tasks = []
-            for index, image_stream in enumerate(batch):
-                image_key = f"{formatted_date}/{formatted_time}/{i + index + 1}"
-                image_stream.seek(0)
-                tasks.append(upload_file_async(s3_client, image_stream, image_key))
-            batch_urls = await asyncio.gather(*tasks)
-            s3_urls.extend(batch_urls)
+def detect_image_format(head: bytes, name: Optional[str] = None) -> str:
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    for signature, image_format in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format
 
-    print(f"Upload completed in {time.time() - start_time} seconds")
-    return s3_urls
+    # 판별할 수 없으면 ZIP 엔트리 이름의 확장자 사용
+    extension = Path(name or "").suffix.lower().lstrip(".")
+    return IMAGE_EXTENSIONS.get(extension, "png")
 
-async def upload_file_async(s3_client, image_stream: BytesIO, key: str) -> str:
-    image_stream.seek(0)
-    image = Image.open(image_stream)
-    format = image.format.lower()
-    try:
-        image_stream.seek(0)
-        await s3_client.upload_fileobj(
-            image_stream,
-            settings.AWS_S3_BUCKET,
-            f"{key}.{format}",
-            ExtraArgs={
-                'ContentType': f'image/{format}',
+
+@dataclass
+class UploadJob:
+    # 한 번의 요청(결과 ZIP)에 대한 업로드 진행 상황 / 지연 시간
+    name: str
+    total: int
+    completed: int = 0
+    uploaded_bytes: int = 0
+    latencies: List[float] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def record(self, size: int, latency: float):
+        self.completed += 1
+        self.uploaded_bytes += size
+        self.latencies.append(latency)
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "job": self.name,
+            "completed": self.completed,
+            "total": self.total,
+            "uploaded_bytes": self.uploaded_bytes,
+            "elapsed": round(time.perf_counter() - self.started_at, 4),
+            "latency_avg": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "latency_max": round(latencies[-1], 4) if latencies else 0.0,
+        }
+
+
+class S3UploadEngine:
+    # 애플리케이션 생명주기 동안 하나의 S3 클라이언트(커넥션 풀)를 재사용하고, 동시에 진행하는 업로드 수를 제한
+
+    def __init__(self):
+        self._session = aioboto3.Session()
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client = None
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(settings.S3_UPLOAD_CONCURRENCY)
+
+    async def get_client(self):
+        async with self._lock:
+            if self._client is None:
+                self._exit_stack = AsyncExitStack()
+                self._client = await self._exit_stack.enter_async_context(self._session.client(
+                    's3', **get_s3_client_kwargs(max_pool_connections=settings.S3_UPLOAD_CONCURRENCY)
+                ))
+            return self._client
+
+    async def close(self):
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+
+    async def upload(self, fileobj: BinaryIO, key: str, name: Optional[str] = None, job: Optional[UploadJob] = None) -> str:
+        async with self._semaphore:
+            return await self._upload(fileobj, key, name, job)
+
+    async def _upload(self, fileobj: BinaryIO, key: str, name: Optional[str], job: Optional[UploadJob]) -> str:
+        # fileobj는 앞부분만 읽어 형식을 판별한 뒤 처음부터 그대로 스트리밍 (ZIP 엔트리도 seek 가능)
+        head = fileobj.read(16)
+        fileobj.seek(0)
+        image_format = detect_image_format(head, name)
+        object_key = f"{key}.{image_format}"
+
+        client = await self.get_client()
+        started_at = time.perf_counter()
+        try:
+            await client.upload_fileobj(
+                fileobj,
+                settings.AWS_S3_BUCKET,
+                object_key,
+                ExtraArgs={
+                    'ContentType': f'image/{image_format}',
+                    'ContentDisposition': 'inline'
+                }
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise HTTPException(status_code=500, detail=f"업로드 실패: {e}")
+
+        if job is not None:
+            job.record(fileobj.tell(), time.perf_counter() - started_at)
+        return get_s3_url(object_key)
+
+    async def upload_zip_stream(self, chunks: AsyncIterator[bytes], key_prefix: str) -> List[str]:
+        # 결과 ZIP을 받는 대로 엔트리 단위로 업로드 (메모리에는 동시 업로드 수 x part 크기까지만 보관)
+        job = UploadJob(name=key_prefix, total=0)
+        uploads: List[asyncio.Task] = []
+
+        try:
+            async for entry in iter_zip_entries(chunks):
+                if entry.is_dir:
+                    continue
+                job.total += 1
+                uploads.append(await self._start_entry_upload(entry, f"{key_prefix}/{job.total}", job))
+
+            urls = await asyncio.gather(*uploads)
+        except BaseException:
+            for upload in uploads:
+                upload.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
+            raise
+
+        print(f"S3 upload job finished: {job.summary()}")
+        return list(urls)
+
+    async def _start_entry_upload(self, entry: ZipStreamEntry, key: str, job: UploadJob) -> asyncio.Task:
+        # 엔트리 데이터는 스트림 순서대로만 읽을 수 있으므로 part를 읽는 것까지는 여기서 하고, 전송은 task로 넘김
+        # part 하나를 메모리에 올릴 때마다 semaphore를 잡고, part를 task로 넘기기 전까지는 여기서 책임지고 놓음
+        part_size = settings.S3_MULTIPART_CHUNK_SIZE_MB * (1024 ** 2)
+
+        first_part = await self._read_part(entry, part_size)
+        try:
+            image_format = detect_image_format(first_part[:16], entry.name)
+            object_key = f"{key}.{image_format}"
+            extra_args = {
+                'ContentType': f'image/{image_format}',
                 'ContentDisposition': 'inline'
             }
+
+            client = await self.get_client()
+            started_at = time.perf_counter()
+
+            if not entry.eof:
+                response = await client.create_multipart_upload(Bucket=settings.AWS_S3_BUCKET, Key=object_key, **extra_args)
+        except BaseException as e:
+            self._semaphore.release()
+            if isinstance(e, (BotoCoreError, ClientError)):
+                raise HTTPException(status_code=500, detail=f"업로드 실패: {e}")
+            raise
+
+        if entry.eof:
+            # part 크기보다 작은 이미지는 한 번에 업로드
+            return self._start_with_permit(self._put_object(client, object_key, first_part, extra_args, job, started_at))
+
+        upload_id = response["UploadId"]
+        parts = [self._start_with_permit(self._upload_part(client, object_key, upload_id, 1, first_part))]
+        size = len(first_part)
+
+        try:
+            while not entry.eof:
+                part = await self._read_part(entry, part_size)
+                if not part:
+                    self._semaphore.release()
+                    break
+                size += len(part)
+                parts.append(self._start_with_permit(self._upload_part(client, object_key, upload_id, len(parts) + 1, part)))
+        except BaseException:
+            for part in parts:
+                part.cancel()
+            await asyncio.gather(*parts, return_exceptions=True)
+            await client.abort_multipart_upload(Bucket=settings.AWS_S3_BUCKET, Key=object_key, UploadId=upload_id)
+            raise
+
+        return asyncio.create_task(self._complete_multipart_upload(client, object_key, upload_id, parts, size, job, started_at))
+
+    def _start_with_permit(self, coro) -> asyncio.Task:
+        # 읽어 둔 part의 permit은 task가 끝날 때 놓음
+        # (coroutine의 finally가 아닌 done callback에서 놓아야 시작 전에 취소된 task의 permit도 반환된다)
+        task = asyncio.create_task(coro)
+        task.add_done_callback(lambda _: self._semaphore.release())
+        return task
+
+    async def _read_part(self, entry: ZipStreamEntry, part_size: int) -> bytes:
+        await self._semaphore.acquire()
+        try:
+            return await entry.read(part_size)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def _put_object(self, client, object_key: str, body: bytes, extra_args: dict, job: UploadJob, started_at: float) -> str:
+        try:
+            await client.put_object(Bucket=settings.AWS_S3_BUCKET, Key=object_key, Body=body, **extra_args)
+        except (BotoCoreError, ClientError) as e:
+            raise HTTPException(status_code=500, detail=f"업로드 실패: {e}")
+
+        job.record(len(body), time.perf_counter() - started_at)
+        return get_s3_url(object_key)
+
+    async def _upload_part(self, client, object_key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = await client.upload_part(
+            Bucket=settings.AWS_S3_BUCKET,
+            Key=object_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
         )
-        s3_url = f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_S3_REGION_STATIC}.amazonaws.com/{key}.{format}"
-        return s3_url
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"업로드 실패: {e}")
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    async def _complete_multipart_upload(self, client, object_key: str, upload_id: str, parts: List[asyncio.Task],
+                                         size: int, job: UploadJob, started_at: float) -> str:
+        try:
+            await client.complete_multipart_upload(
+                Bucket=settings.AWS_S3_BUCKET,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": await asyncio.gather(*parts)},
+            )
+        except BaseException as e:
+            for part in parts:
+                part.cancel()
+            await asyncio.gather(*parts, return_exceptions=True)
+            await client.abort_multipart_upload(Bucket=settings.AWS_S3_BUCKET, Key=object_key, UploadId=upload_id)
+            if isinstance(e, (BotoCoreError, ClientError)):
+                raise HTTPException(status_code=500, detail=f"업로드 실패: {e}")
+            raise
+
+        job.record(size, time.perf_counter() - started_at)
+        return get_s3_url(object_key)
+
+
+s3_upload_engine = S3UploadEngine()
+
+
+async def upload_zip_stream_async(chunks: AsyncIterator[bytes], formatted_date: str, formatted_time: str) -> List[str]:
+    return await s3_upload_engine.upload_zip_stream(chunks, f"{formatted_date}/{formatted_time}")
+
+
+async def upload_files_async(image_list: List[BinaryIO], formatted_date: str, formatted_time: str) -> List[str]:
+    job = UploadJob(name=f"{formatted_date}/{formatted_time}", total=len(image_list))
+    urls = await asyncio.gather(*(
+        s3_upload_engine.upload(image_stream, f"{formatted_date}/{formatted_time}/{index + 1}", job=job)
+        for index, image_stream in enumerate(image_list)
+    ))
+    print(f"S3 upload job finished: {job.summary()}")
+    return list(urls)
+
+async def create_result_upload() -> Optional[str]:
+    # direct 모드: AI 워커가 결과 이미지를 이 요청의 경로 아래에만 올릴 수 있는 presigned POST를 발급
+    if settings.RESULT_UPLOAD_MODE != "direct":
+        return None
+
+    now = datetime.now()
+    key_prefix = f"{now.strftime('%Y%m%d')}/{now.strftime('%H%M%S%f')}"
+
+    client = await s3_upload_engine.get_client()
+    presigned_post = await client.generate_presigned_post(
+        Bucket=settings.AWS_S3_BUCKET,
+        Key=f"{key_prefix}/${{filename}}",
+        Fields={"Content-Disposition": "inline"},
+        Conditions=[
+            {"Content-Disposition": "inline"},
+            ["starts-with", "$Content-Type", "image/"],
+        ],
+        ExpiresIn=settings.RESULT_UPLOAD_URL_EXPIRES,
+    )
+
+    return json.dumps({
+        "url": presigned_post["url"],
+        "fields": presigned_post["fields"],
+        "key_prefix": key_prefix,
+        "url_base": get_s3_base_url(),
+    })
+
 
 async def delete_files_async(image_url_list: List[str]):
-    session = aioboto3.Session()
-    async with session.client(
-        's3',
-        aws_access_key_id=settings.AWS_S3_ACCESS_KEY,
-        aws_secret_access_key=settings.AWS_S3_SECRET_KEY
-    ) as s3_client:
-        for url in image_url_list:
-            await delete_file_async(s3_client, url)
+    s3_client = await s3_upload_engine.get_client()
+    for url in image_url_list:
+        await delete_file_async(s3_client, url)
 
 async def delete_file_async(s3_client, url: str):
     try:
-        await s3_client.delete_object(Bucket=settings.AWS_S3_BUCKET, Key=url.split(".com/")[-1])
+        await s3_client.delete_object(Bucket=settings.AWS_S3_BUCKET, Key=get_s3_key(url))
     except (BotoCoreError, ClientError) as e:
         raise HTTPException(status_code=500, detail=f"삭제 실패: {e}")
@@ -0,0 +1,68 @@
+import json
+import time
+from typing import AsyncIterator, Optional
+
+from aioredis import Redis
+
+from core.config import settings
+
+# AI 워커가 task 상태가 바뀔 때마다 발행하는 채널 / 마지막 이벤트를 보관하는 key
+TASK_EVENT_CHANNEL = "task_events:{task_id}"
+TASK_EVENT_LAST_KEY = "task_events:last:{task_id}"
+# task를 요청한 회원 (이벤트 스트림은 요청한 회원만 구독 가능)
+TASK_OWNER_KEY = "task_events:owner:{task_id}"
+TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+def format_sse(data: str, event: Optional[str] = None) -> str:
+    message = f"data: {data}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+
+async def register_task_owner(redis: Redis, task_id: Optional[str], member_id: int):
+    if task_id:
+        await redis.setex(TASK_OWNER_KEY.format(task_id=task_id), settings.TASK_OWNER_TTL, str(member_id))
+
+
+async def is_task_owner(redis: Redis, task_id: str, member_id: int) -> bool:
+    owner = await redis.get(TASK_OWNER_KEY.format(task_id=task_id))
+    return owner is not None and owner == str(member_id)
+
+
+async def stream_task_events(redis: Redis, task_id: str) -> AsyncIterator[str]:
+    # task의 진행/완료 이벤트를 Server-Sent Events 형식으로 전달하고 완료되면 스트림을 닫음
+    # redis는 앱 공용 커넥션 풀 (구독하는 동안만 커넥션 하나를 빌려 씀)
+    pubsub = redis.pubsub()
+
+    try:
+        await pubsub.subscribe(TASK_EVENT_CHANNEL.format(task_id=task_id))
+
+        # 구독하기 전에 이미 끝났거나 진행 중인 task는 보관된 마지막 이벤트로 바로 알림
+        last_event = await redis.get(TASK_EVENT_LAST_KEY.format(task_id=task_id))
+        if last_event:
+            state = json.loads(last_event)["task_status"]
+            yield format_sse(last_event, state)
+            if state in TERMINAL_STATES:
+                return
+
+        expired_at = time.monotonic() + settings.TASK_EVENT_STREAM_TIMEOUT
+        while time.monotonic() < expired_at:
+            message = await pubsub.get_message(ignore_subscribe_messages=True,
+                                               timeout=settings.TASK_EVENT_KEEPALIVE_SECONDS)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            state = json.loads(message["data"])["task_status"]
+            yield format_sse(message["data"], state)
+            if state in TERMINAL_STATES:
+                return
+
+        yield format_sse(json.dumps({"task_id": task_id, "task_status": "TIMEOUT"}), "TIMEOUT")
+
+    finally:
+        # 클라이언트가 연결을 끊어도 (generator 취소) 구독은 정리
+        await pubsub.unsubscribe()
+        await pubsub.close()
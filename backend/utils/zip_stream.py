@@ -0,0 +1,169 @@
+import struct
+import zlib
+from typing import AsyncIterator
+
+# ZIP 아카이브를 앞에서부터 읽으며 local file header 단위로 엔트리를 꺼냄
+# (central directory는 파일 끝에 있으므로 읽지 않고, 만나면 종료)
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+LOCAL_HEADER_FORMAT = "<HHHHHIIIHH"
+LOCAL_HEADER_SIZE = struct.calcsize(LOCAL_HEADER_FORMAT)
+ZIP64_EXTRA_ID = 0x0001
+
+FLAG_ENCRYPTED = 0x01
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+STORED = 0
+DEFLATED = 8
+
+READ_SIZE = 64 * 1024
+
+
+class BufferedStream:
+    # 비동기 chunk 스트림에서 원하는 크기만큼 읽을 수 있도록 남은 데이터를 보관
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _fill(self, size: int):
+        while len(self._buffer) < size and not self._eof:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._eof = True
+
+    async def read(self, size: int) -> bytes:
+        # 최대 size 바이트 (스트림이 끝났으면 빈 bytes)
+        await self._fill(1)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def read_exactly(self, size: int) -> bytes:
+        await self._fill(size)
+        if len(self._buffer) < size:
+            raise ValueError("ZIP 스트림이 중간에 끊겼습니다.")
+        return await self.read(size)
+
+    def unread(self, data: bytes):
+        self._buffer[:0] = data
+
+
+class ZipStreamEntry:
+    # 엔트리 데이터는 순서대로 한 번만 읽을 수 있고, 다음 엔트리로 넘어가면 남은 데이터는 버려진다
+
+    def __init__(self, stream: BufferedStream, name: str, flags: int, method: int,
+                 crc: int, compressed_size: int):
+        if flags & FLAG_ENCRYPTED:
+            raise ValueError(f"암호화된 ZIP 엔트리는 지원하지 않습니다. : {name}")
+        if method not in (STORED, DEFLATED):
+            raise ValueError(f"지원하지 않는 압축 방식입니다. : {name} ({method})")
+        if method == STORED and flags & FLAG_DATA_DESCRIPTOR:
+            # 크기를 모르는 무압축 엔트리는 끝을 알 수 없음
+            raise ValueError(f"크기가 기록되지 않은 무압축 엔트리는 지원하지 않습니다. : {name}")
+
+        self.name = name
+        self._stream = stream
+        self._method = method
+        self._has_data_descriptor = bool(flags & FLAG_DATA_DESCRIPTOR)
+        self._crc = crc
+        self._remaining = None if self._has_data_descriptor else compressed_size
+
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == DEFLATED else None
+        self._output = bytearray()
+        self._source_finished = False
+        self._running_crc = 0
+
+    @property
+    def is_dir(self) -> bool:
+        return self.name.endswith("/")
+
+    @property
+    def eof(self) -> bool:
+        return self._source_finished and not self._output
+
+    async def _read_source(self):
+        if self._remaining is None:
+            compressed = await self._stream.read(READ_SIZE)
+        else:
+            compressed = await self._stream.read_exactly(min(READ_SIZE, self._remaining)) if self._remaining else b""
+            self._remaining -= len(compressed)
+
+        if self._decompressor is None:
+            self._output += compressed
+            finished = self._remaining == 0
+        else:
+            self._output += self._decompressor.decompress(compressed)
+            finished = self._decompressor.eof or self._remaining == 0
+            if self._decompressor.eof and self._decompressor.unused_data:
+                # 크기를 모르는 엔트리는 압축 스트림이 끝난 뒤의 데이터를 다음 헤더로 돌려줌
+                self._stream.unread(self._decompressor.unused_data)
+
+        if not compressed and not finished:
+            raise ValueError(f"ZIP 엔트리가 중간에 끊겼습니다. : {self.name}")
+
+        if finished:
+            self._source_finished = True
+            await self._finish()
+
+    async def _finish(self):
+        if self._has_data_descriptor:
+            descriptor = await self._stream.read_exactly(4)
+            if descriptor == DATA_DESCRIPTOR_SIGNATURE:
+                descriptor = await self._stream.read_exactly(4)
+            self._crc = struct.unpack("<I", descriptor)[0]
+            await self._stream.read_exactly(8)
+
+    async def read(self, size: int) -> bytes:
+        # 최대 size 바이트의 압축 해제된 데이터 (엔트리가 끝났으면 빈 bytes)
+        while len(self._output) < size and not self._source_finished:
+            await self._read_source()
+
+        data = bytes(self._output[:size])
+        del self._output[:size]
+
+        self._running_crc = zlib.crc32(data, self._running_crc)
+        if self.eof and self._running_crc != self._crc:
+            raise ValueError(f"ZIP 엔트리의 CRC가 일치하지 않습니다. : {self.name}")
+        return data
+
+    async def drain(self):
+        while not self.eof:
+            await self.read(READ_SIZE)
+
+
+async def iter_zip_entries(chunks: AsyncIterator[bytes]) -> AsyncIterator[ZipStreamEntry]:
+    # 아카이브 전체를 메모리에 올리지 않고 도착하는 순서대로 엔트리를 하나씩 전달
+    stream = BufferedStream(chunks)
+
+    while True:
+        signature = await stream.read(4)
+        if signature != LOCAL_HEADER_SIGNATURE:
+            # central directory (또는 빈 스트림)에 도달
+            break
+
+        (_, flags, method, _, _, crc, compressed_size, _,
+         name_length, extra_length) = struct.unpack(LOCAL_HEADER_FORMAT, await stream.read_exactly(LOCAL_HEADER_SIZE))
+        name = (await stream.read_exactly(name_length)).decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+        extra = await stream.read_exactly(extra_length)
+
+        if compressed_size == 0xFFFFFFFF:
+            compressed_size = _get_zip64_compressed_size(extra, name)
+
+        entry = ZipStreamEntry(stream, name, flags, method, crc, compressed_size)
+        yield entry
+        await entry.drain()
+
+
+def _get_zip64_compressed_size(extra: bytes, name: str) -> int:
+    # local header의 ZIP64 extra field는 (원본 크기, 압축 크기) 순서
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, size = struct.unpack("<HH", extra[offset:offset + 4])
+        if header_id == ZIP64_EXTRA_ID and size >= 16:
+            return struct.unpack("<Q", extra[offset + 12:offset + 20])[0]
+        offset += 4 + size
+    raise ValueError(f"ZIP64 엔트리의 크기를 찾을 수 없습니다. : {name}")
@@ -316,3 +316,59 @@ export const getTaskStatus = async (task_id: string) => {
     throw new Error('Failed to get task-status');
   }
 };
+
+// ai 동작 완료 이벤트 구독 (SSE)
+// 완료 이벤트를 받으면 결과를 한 번 조회해 onDone으로 전달 (결과 조회 시 S3 업로드 / 토큰 차감이 진행됨)
+const TASK_EVENT_TERMINAL_STATES = ['SUCCESS', 'FAILURE', 'REVOKED', 'TIMEOUT'];
+const TASK_RUNNING_STATES = ['PENDING', 'STARTED', 'PROGRESS', 'RETRY'];
+
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+export const subscribeTaskStatus = (task_id: string, onDone: (response: any) => void, onError: (error: unknown) => void) => {
+  let eventSource: EventSource | null = null;
+  let closed = false;
+
+  const open = () => {
+    // EventSource는 Authorization 헤더를 보낼 수 없으므로 Access 토큰을 query로 전달
+    const token = localStorage.getItem('accessToken') ?? '';
+    eventSource = new EventSource(
+      `${import.meta.env.VITE_API}/generation/tasks/${task_id}/events?token=${encodeURIComponent(token)}`,
+      { withCredentials: true }
+    );
+
+    TASK_EVENT_TERMINAL_STATES.forEach((state) => eventSource?.addEventListener(state, checkStatus));
+    eventSource.onerror = () => {
+      // 일시적인 연결 끊김은 브라우저가 다시 연결하고, 인증 만료 등으로 닫힌 경우에만 직접 확인
+      if (eventSource?.readyState === EventSource.CLOSED) checkStatus();
+    };
+  };
+
+  const checkStatus = async () => {
+    eventSource?.close();
+    if (closed) return;
+
+    try {
+      // 토큰이 만료된 경우 여기서 재발급되므로, 아직 진행 중이면 새 토큰으로 다시 구독
+      const response = await getTaskStatus(task_id);
+      if (closed) return;
+
+      if (TASK_RUNNING_STATES.includes(response.task_status)) {
+        setTimeout(() => !closed && open(), 1000);
+        return;
+      }
+
+      closed = true;
+      onDone(response);
+    } catch (error) {
+      closed = true;
+      onError(error);
+    }
+  };
+
+  open();
+
+  // 구독 해제
+  return () => {
+    closed = true;
+    eventSource?.close();
+  };
+};
@@ -3,7 +3,7 @@ import PromptParams from '../params/PromptParams';
 import InpaintingDisplay from '../outputDisplay/InpaintingDisplay';
 import { useInpaintingParams } from '../../../hooks/generation/params/useInpaintingParams';
 import { useDispatch, useSelector } from 'react-redux';
-import { postInpaintingGeneration, getClip, getTaskStatus } from '../../../api/generation';
+import { postInpaintingGeneration, getClip, subscribeTaskStatus } from '../../../api/generation';
 import { convertStringToFile } from '../../../utils/convertStringToFile';
 import GenerateButton from '../common/GenerateButton';
 import { setIsNegativePrompt, setClipData } from '../../../store/slices/generation/inpaintingSlice';
@@ -158,35 +158,29 @@ const InpaintingLayout = () => {
   ]);
 
   useEffect(() => {
-    let intervalId: NodeJS.Timeout | undefined;
-
-    const fetchTaskStatus = async () => {
-      console.log(clipIsLoading, clipTaskId);
-      if (clipIsLoading && clipTaskId) {
-        try {
-          const response = await getTaskStatus(clipTaskId);
-          if (response.task_status === 'SUCCESS') {
-            clearInterval(intervalId); // 성공 시 상태 확인 중지
-            dispatch(setClipData(response.result_data));
-
-            dispatch(setIsLoading({ tab: 'clip', value: false }));
-            dispatch(setTaskId({ tab: 'clip', value: null }));
-          }
-        } catch (error) {
-          console.error('Failed to get task status:', error);
-          dispatch(setIsLoading({ tab: 'clip', value: false }));
-          clearInterval(intervalId);
+    if (!clipIsLoading || !clipTaskId) return;
+
+    // polling 대신 SSE로 완료 이벤트를 받은 뒤 결과를 한 번만 조회
+    const unsubscribe = subscribeTaskStatus(
+      clipTaskId,
+      (response) => {
+        if (response.task_status === 'SUCCESS') {
+          dispatch(setClipData(response.result_data));
+        } else {
+          console.error('Failed to get clip data:', response.detail?.result_data || response.result_data);
         }
-      }
-    };
 
-    if (clipTaskId) {
-      fetchTaskStatus();
-      intervalId = setInterval(fetchTaskStatus, 1000); // 1초마다 상태 확인
-    }
+        dispatch(setIsLoading({ tab: 'clip', value: false }));
+        dispatch(setTaskId({ tab: 'clip', value: null }));
+      },
+      (error) => {
+        console.error('Failed to get task status:', error);
+        dispatch(setIsLoading({ tab: 'clip', value: false }));
+      }
+    );
 
-    return () => clearInterval(intervalId); // 컴포넌트 언마운트 시 정리
-  }, [isLoading, dispatch, clipIsLoading, clipTaskId]);
+    return unsubscribe; // 컴포넌트 언마운트 시 정리
+  }, [dispatch, clipIsLoading, clipTaskId]);
 
   const handleNegativePromptChange = () => {
     dispatch(setIsNegativePrompt(!isNegativePrompt));
@@ -1,4 +1,4 @@
-import { useState, useEffect, lazy, Suspense } from 'react';
+import { useState, useEffect, useRef, lazy, Suspense } from 'react';
 import { Routes, Route, Link, useLocation } from 'react-router-dom';
 const TextToImage = lazy(() => import('../components/generation/layouts/Txt2ImgLayout'));
 const ImageToImage = lazy(() => import('../components/generation/layouts/Img2ImgLayout'));
@@ -23,7 +23,7 @@ import { useImg2ImgOutputs } from '../hooks/generation/outputs/useImg2ImgOutputs
 import { useInpaintingOutputs } from '../hooks/generation/outputs/useInpaintingOutputs';
 import { useRemoveBgOutputs } from '../hooks/generation/outputs/useRemoveBgOutputs';
 import { useCleanupOutputs } from '../hooks/generation/outputs/useCleanupOutputs';
-import { getTaskStatus } from '../api/generation';
+import { subscribeTaskStatus } from '../api/generation';
 import { RootState } from '@/store/store';
 import { upDateMyInfo } from '@/api/user';
 
@@ -42,58 +42,80 @@ const Generation = () => {
   // generatedOutput에서 각 탭의 상태 가져오기
   const tabsState = useSelector((state: RootState) => tabs.map((tab) => state.generatedOutput[tab]));
 
+  // 완료 시점에 최신 탭 상태를 읽기 위한 ref와 task별 이벤트 구독 해제 함수
+  const tabsStateRef = useRef(tabsState);
+  tabsStateRef.current = tabsState;
+  const subscriptions = useRef<Record<string, () => void>>({});
+
   useEffect(() => {
-    const fetchTaskStatusForTabs = async () => {
-      for (let index = 0; index < tabsState.length; index++) {
-        const tabState = tabsState[index];
-        const tabName = tabs[index];
+    const activeTaskIds = new Set<string>();
 
-        if (!tabState) continue;
+    tabsState.forEach((tabState, index) => {
+      const tabName = tabs[index];
+      if (!tabState) return;
 
-        const { taskId, isLoading, allOutputs, output } = tabState;
+      const { taskId, isLoading } = tabState;
+      if (!taskId || !isLoading) return;
 
-        if (taskId && isLoading) {
-          try {
-            dispatch(setIsCheckedOutput({ tab: tabName, value: false }));
-            const response = await getTaskStatus(taskId);
+      activeTaskIds.add(taskId);
+      if (subscriptions.current[taskId]) return;
 
-            if (response.task_status === 'SUCCESS') {
-              dispatch(setOutputImgsUrl({ tab: tabName, value: response.result_data }));
+      // polling 대신 SSE로 완료 이벤트를 받은 뒤 결과를 한 번만 조회
+      dispatch(setIsCheckedOutput({ tab: tabName, value: false }));
+      subscriptions.current[taskId] = subscribeTaskStatus(
+        taskId,
+        (response) => {
+          delete subscriptions.current[taskId];
+          const { allOutputs, output } = tabsStateRef.current[index];
 
-              const outputsCnt = allOutputs.outputsCnt + output.imgsCnt;
-              const outputsInfo = [
-                {
-                  id: response.result_data_log.id,
-                  imgsUrl: response.result_data,
-                  prompt: response.result_data_log.prompt
-                },
-                ...allOutputs.outputsInfo
-              ];
+          if (response.task_status === 'SUCCESS') {
+            dispatch(setOutputImgsUrl({ tab: tabName, value: response.result_data }));
 
-              dispatch(setAllOutputsInfo({ tab: tabName, outputsCnt, outputsInfo }));
-              dispatch(setIsLoading({ tab: tabName, value: false }));
-              dispatch(setTaskId({ tab: tabName, value: null }));
-              upDateMyInfo();
-            } else if (response.detail && response.detail.task_status === 'FAILURE') {
-              dispatch(setIsLoading({ tab: tabName, value: false }));
-              dispatch(setTaskId({ tab: tabName, value: null }));
-              console.error('Image generation failed:', response.detail.result_data || 'Unknown error');
-              alert(`Image generation failed: ${response.detail.result_data || 'Unknown error'}`);
-            }
-          } catch (error) {
-            console.error(`Failed to get task status for ${tabName}:`, error);
+            const outputsCnt = allOutputs.outputsCnt + output.imgsCnt;
+            const outputsInfo = [
+              {
+                id: response.result_data_log.id,
+                imgsUrl: response.result_data,
+                prompt: response.result_data_log.prompt
+              },
+              ...allOutputs.outputsInfo
+            ];
+
+            dispatch(setAllOutputsInfo({ tab: tabName, outputsCnt, outputsInfo }));
             dispatch(setIsLoading({ tab: tabName, value: false }));
+            dispatch(setTaskId({ tab: tabName, value: null }));
+            upDateMyInfo();
+          } else {
+            const resultData = response.detail?.result_data || response.result_data || 'Unknown error';
+            dispatch(setIsLoading({ tab: tabName, value: false }));
+            dispatch(setTaskId({ tab: tabName, value: null }));
+            console.error('Image generation failed:', resultData);
+            alert(`Image generation failed: ${resultData}`);
           }
+        },
+        (error) => {
+          delete subscriptions.current[taskId];
+          console.error(`Failed to get task status for ${tabName}:`, error);
+          dispatch(setIsLoading({ tab: tabName, value: false }));
         }
-      }
-    };
+      );
+    });
 
-    const intervalId = setInterval(fetchTaskStatusForTabs, 1000); // 주기적으로 각 탭의 상태 확인
-
-    // 컴포넌트 언마운트 시 clearInterval 호출
-    return () => clearInterval(intervalId);
+    // 더 이상 기다리지 않는 task의 구독은 해제
+    Object.keys(subscriptions.current).forEach((taskId) => {
+      if (!activeTaskIds.has(taskId)) {
+        subscriptions.current[taskId]();
+        delete subscriptions.current[taskId];
+      }
+    });
   }, [dispatch, tabsState]); // 모든 탭 상태를 의존성으로 추가
 
+  // 컴포넌트 언마운트 시 모든 구독 해제
+  useEffect(() => {
+    const currentSubscriptions = subscriptions.current;
+    return () => Object.values(currentSubscriptions).forEach((unsubscribe) => unsubscribe());
+  }, []);
+
   const [isSidebarOpen, setIsSidebarOpen] = useState(false);
   const location = useLocation(); // 현재 경로 감지
 